@@ -0,0 +1,187 @@
+"""
+Synthetic media for the benchmarks (voice notes, PDFs, documents, spreadsheets, images).
+
+Everything is generated locally and deterministically from a seed, so runs
+are comparable between commits without shipping binary fixtures.
+"""
+import io
+import math
+import random
+import struct
+import wave
+
+WORDS = (
+    "order invoice product price quantity delivery warehouse stock pump valve "
+    "cable steel pipe motor filter bearing pallet shipment discount catalogue"
+).split()
+
+
+def sentence(rng: random.Random, length: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize() + "."
+
+
+def make_wav(seconds: float = 5.0, sample_rate: int = 16000, seed: int = 0) -> bytes:
+    """Mono 16-bit WAV: a tone modulated like speech, with leading/trailing silence"""
+    rng = random.Random(seed)
+    total = int(seconds * sample_rate)
+    pad = int(0.5 * sample_rate)
+    frames = bytearray()
+    for i in range(total):
+        if i < pad or i > total - pad:
+            sample = 0
+        else:
+            envelope = 0.5 + 0.5 * math.sin(2 * math.pi * 3 * i / sample_rate)
+            sample = int(8000 * envelope * math.sin(2 * math.pi * 220 * i / sample_rate) + rng.randint(-200, 200))
+        frames += struct.pack("<h", sample)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+def _escape_pdf(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_text_pdf(pages: int = 1, lines_per_page: int = 40, seed: int = 0) -> bytes:
+    """PDF with a real text layer (Helvetica), written by hand so no PDF library is needed"""
+    rng = random.Random(seed)
+    objects = []  # object bodies, numbered from 1
+
+    font_id = 3
+    page_ids = []
+    for _ in range(pages):
+        text = "\n".join(
+            f"BT /F1 10 Tf 40 {800 - 18 * line} Td ({_escape_pdf(sentence(rng))}) Tj ET"
+            for line in range(lines_per_page)
+        ).encode("latin-1")
+        content_id = 4 + len(objects)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(text) + text + b"\nendstream")
+        page_ids.append(4 + len(objects))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, content_id)
+        )
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ] + objects
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_text_image(lines: list, width: int = 1000, font_size: int = 28) -> "Image.Image":
+    """White image with black text lines (what a photographed price list looks like to OCR)"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    try:
+        font = ImageFont.truetype("DejaVuSans.ttf", font_size)
+    except OSError:
+        font = ImageFont.load_default()
+    height = 40 + len(lines) * int(font_size * 1.6)
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    for index, line in enumerate(lines):
+        draw.text((20, 20 + index * int(font_size * 1.6)), line, fill="black", font=font)
+    return image
+
+
+def make_png(lines: int = 10, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    buffer = io.BytesIO()
+    make_text_image([sentence(rng, 8) for _ in range(lines)]).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+ARABIC_WORDS = "طلب فاتورة منتج سعر كمية توصيل مستودع مخزون مضخة صمام كابل فولاذ أنبوب محرك".split()
+
+
+def make_scanned_pdf(pages: int = 1, lines_per_page: int = 30, seed: int = 0) -> bytes:
+    """Image-only PDF (no text layer), like a scanned or photographed document"""
+    rng = random.Random(seed)
+    images = [
+        make_text_image([sentence(rng, 8) for _ in range(lines_per_page)], width=1240, font_size=24).convert("L")
+        for _ in range(pages)
+    ]
+    buffer = io.BytesIO()
+    images[0].save(buffer, format="PDF", save_all=True, append_images=images[1:], resolution=150)
+    return buffer.getvalue()
+
+
+def make_docx(paragraphs: int = 50, table_rows: int = 20, seed: int = 0) -> bytes:
+    """Word document with headings, paragraphs and a product table"""
+    from docx import Document
+
+    rng = random.Random(seed)
+    document = Document()
+    document.add_heading("Quotation", level=1)
+    for index in range(paragraphs):
+        document.add_paragraph(" ".join(sentence(rng) for _ in range(3)))
+        if table_rows and index == paragraphs // 2:
+            table = document.add_table(rows=1, cols=4)
+            for cell, title in zip(table.rows[0].cells, ("Item", "Description", "Quantity", "Unit price")):
+                cell.text = title
+            for row in range(table_rows):
+                cells = table.add_row().cells
+                cells[0].text = f"P-{row:04d}"
+                cells[1].text = sentence(rng, 5)
+                cells[2].text = str(rng.randint(1, 500))
+                cells[3].text = f"{rng.uniform(1, 999):.2f}"
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def make_xlsx(rows: int = 1000, columns: int = 8, sheets: int = 1, seed: int = 0) -> bytes:
+    """Price-list style workbook (header row + mixed text/number cells), written in write-only mode"""
+    from openpyxl import Workbook
+
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    for sheet_index in range(sheets):
+        sheet = workbook.create_sheet(f"Sheet{sheet_index + 1}")
+        sheet.append(["Item", "Description"] + [f"Column {c}" for c in range(columns - 2)])
+        for row in range(rows):
+            sheet.append(
+                [f"P-{row:06d}", sentence(rng, 4)]
+                + [round(rng.uniform(0, 1000), 2) if c % 2 else rng.choice(WORDS) for c in range(columns - 2)]
+            )
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def make_image(language: str = "en", lines: int = 10, seed: int = 0) -> bytes:
+    """PNG text image in English ("en"), Arabic ("ar") or both ("mixed")"""
+    rng = random.Random(seed)
+
+    def arabic_line():
+        return " ".join(rng.choice(ARABIC_WORDS) for _ in range(6))
+
+    text_lines = []
+    for index in range(lines):
+        if language == "ar" or (language == "mixed" and index % 2):
+            text_lines.append(arabic_line())
+        else:
+            text_lines.append(sentence(rng, 8))
+    buffer = io.BytesIO()
+    make_text_image(text_lines).save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -0,0 +1,245 @@
+"""
+Micro-benchmarks for the document extractors over a generated corpus.
+
+Usage:
+    python -m benchmarks.extractors --sizes small,medium --repeat 3 --output extractors.json
+    python -m benchmarks.extractors --compare extractors.json --output new.json
+
+Covers extract_pdf_text (text-layer and scanned PDFs), extract_docx_text,
+extract_excel_text and extract_image_text (English, Arabic and mixed images).
+Every file runs in a fresh spawned process so imports, model loads and peak
+RSS are measured per case: one cold run (imports + OCR model load), then
+--repeat warm runs. Results are saved as JSON with the commit they were taken
+at; --compare prints the change in median wall time and peak RSS against an
+earlier run and exits 1 when a case got slower than --threshold.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any
+
+from benchmarks import corpus
+
+# (extractor, case name, size, file name, generator)
+CASES = [
+    ("pdf", "text_pdf_1p", "small", "text_1p.pdf", lambda: corpus.make_text_pdf(pages=1)),
+    ("pdf", "text_pdf_20p", "medium", "text_20p.pdf", lambda: corpus.make_text_pdf(pages=20)),
+    ("pdf", "text_pdf_200p", "large", "text_200p.pdf", lambda: corpus.make_text_pdf(pages=200)),
+    ("pdf", "scanned_pdf_1p", "small", "scanned_1p.pdf", lambda: corpus.make_scanned_pdf(pages=1)),
+    ("pdf", "scanned_pdf_4p", "medium", "scanned_4p.pdf", lambda: corpus.make_scanned_pdf(pages=4)),
+    ("pdf", "scanned_pdf_12p", "large", "scanned_12p.pdf", lambda: corpus.make_scanned_pdf(pages=12)),
+    ("docx", "docx_20par", "small", "doc_20.docx", lambda: corpus.make_docx(paragraphs=20, table_rows=10)),
+    ("docx", "docx_500par", "medium", "doc_500.docx", lambda: corpus.make_docx(paragraphs=500, table_rows=100)),
+    ("docx", "docx_5000par", "large", "doc_5000.docx", lambda: corpus.make_docx(paragraphs=5000, table_rows=1000)),
+    ("excel", "xlsx_1k_rows", "small", "sheet_1k.xlsx", lambda: corpus.make_xlsx(rows=1000)),
+    ("excel", "xlsx_20k_rows", "medium", "sheet_20k.xlsx", lambda: corpus.make_xlsx(rows=20000)),
+    ("excel", "xlsx_200k_rows", "large", "sheet_200k.xlsx", lambda: corpus.make_xlsx(rows=100000, sheets=2)),
+    ("image", "image_en", "small", "image_en.png", lambda: corpus.make_image("en", lines=10)),
+    ("image", "image_ar", "small", "image_ar.png", lambda: corpus.make_image("ar", lines=10)),
+    ("image", "image_mixed", "medium", "image_mixed.png", lambda: corpus.make_image("mixed", lines=30)),
+]
+
+
+def write_corpus(directory: Path, cases: List[tuple]) -> Dict[str, Path]:
+    """Generate the corpus files (kept when the directory already has them)"""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for _, name, _, file_name, generate in cases:
+        path = directory / file_name
+        if not path.exists():
+            start_time = time.perf_counter()
+            path.write_bytes(generate())
+            print(f"  generated {file_name} ({path.stat().st_size / 1024:.0f} KB) in {time.perf_counter() - start_time:.1f}s")
+        paths[name] = path
+    return paths
+
+
+def _peak_rss_mb(who: int) -> float:
+    # ru_maxrss is KB on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def run_case(extractor_name: str, path: str, repeat: int) -> Dict[str, Any]:
+    """Runs in a fresh process: one cold call, then `repeat` warm calls"""
+    from benchmarks.env import apply_offline_defaults
+    apply_offline_defaults()
+
+    start_time = time.perf_counter()
+    from src.agents.document_parser import tools
+    from src.agents.document_parser.tools import pdf
+    import_seconds = time.perf_counter() - start_time
+
+    extractor = {
+        "pdf": tools.extract_pdf_text,
+        "docx": tools.extract_docx_text,
+        "excel": tools.extract_excel_text,
+        "image": tools.extract_image_text,
+    }[extractor_name]
+
+    result: Dict[str, Any] = {"import_seconds": round(import_seconds, 3)}
+    try:
+        start_time = time.perf_counter()
+        output = extractor(path)
+        result["cold_seconds"] = round(time.perf_counter() - start_time, 4)
+
+        seconds = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            output = extractor(path)
+            seconds.append(time.perf_counter() - start_time)
+
+        text = output.get("text") or ""
+        result.update({
+            "method": output.get("method"),
+            "chars": len(text),
+            "words": output.get("word_count", len(text.split())),
+            "seconds": [round(s, 4) for s in seconds],
+        })
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        # Reap the OCR page workers so their peak RSS shows up in RUSAGE_CHILDREN
+        if pdf._ocr_pool is not None:
+            pdf._ocr_pool.shutdown()
+
+    result["peak_rss_mb"] = _peak_rss_mb(resource.RUSAGE_SELF)
+    result["children_peak_rss_mb"] = _peak_rss_mb(resource.RUSAGE_CHILDREN)
+    return result
+
+
+def summarize(case: tuple, path: Path, raw: Dict[str, Any]) -> Dict[str, Any]:
+    extractor, name, size, _, _ = case
+    summary = {
+        "extractor": extractor,
+        "case": name,
+        "size": size,
+        "file_bytes": path.stat().st_size,
+        **{k: v for k, v in raw.items() if k != "seconds"},
+    }
+    seconds = raw.get("seconds")
+    if seconds:
+        median = statistics.median(seconds)
+        summary.update({
+            "runs": len(seconds),
+            "min_seconds": round(min(seconds), 4),
+            "median_seconds": round(median, 4),
+            "chars_per_second": round(raw["chars"] / median) if median > 0 else None,
+        })
+    return summary
+
+
+def git_commit() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def print_report(results: List[Dict[str, Any]]):
+    header = f"{'case':<18} {'size':<7} {'KB':>8} {'cold s':>8} {'median s':>9} {'chars':>9} {'chars/s':>10} {'RSS MB':>8} {'child MB':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in sorted(results, key=lambda r: (r["extractor"], r["file_bytes"])):
+        if "median_seconds" not in r:
+            print(f"{r['case']:<18} {r['size']:<7} {r['file_bytes'] / 1024:>8.0f}  ERROR: {r.get('error')}")
+            continue
+        print(
+            f"{r['case']:<18} {r['size']:<7} {r['file_bytes'] / 1024:>8.0f} {r['cold_seconds']:>8.3f} "
+            f"{r['median_seconds']:>9.4f} {r['chars']:>9} {r['chars_per_second'] or 0:>10} "
+            f"{r['peak_rss_mb']:>8} {r['children_peak_rss_mb']:>9}"
+        )
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print deltas against a previous run; return the cases slower than `threshold`"""
+    previous = {r["case"]: r for r in baseline.get("results", [])}
+    regressions = []
+    print(f"\nCompared with {(baseline.get('commit') or 'unknown')[:12]} ({baseline.get('timestamp')}):")
+    for r in results:
+        old = previous.get(r["case"])
+        if not old or "median_seconds" not in old or "median_seconds" not in r:
+            continue
+        change = (r["median_seconds"] - old["median_seconds"]) / old["median_seconds"] if old["median_seconds"] else 0.0
+        rss_change = r["peak_rss_mb"] - old["peak_rss_mb"]
+        flag = ""
+        if change > threshold:
+            flag = "  <-- slower"
+            regressions.append(r["case"])
+        elif change < -threshold:
+            flag = "  faster"
+        print(
+            f"  {r['case']:<18} {old['median_seconds']:.4f}s -> {r['median_seconds']:.4f}s ({change:+.1%}), "
+            f"RSS {rss_change:+.1f} MB{flag}"
+        )
+    return regressions
+
+
+def main(args) -> int:
+    sizes = set(args.sizes.split(","))
+    extractors = set(args.extractors.split(","))
+    cases = [case for case in CASES if case[2] in sizes and case[0] in extractors]
+
+    corpus_dir = Path(args.corpus_dir or os.path.join(tempfile.gettempdir(), "extractor_corpus"))
+    print(f"Corpus in {corpus_dir}")
+    paths = write_corpus(corpus_dir, cases)
+
+    results = []
+    spawn = multiprocessing.get_context("spawn")
+    for case in cases:
+        extractor, name = case[0], case[1]
+        print(f"  running {name} ...", flush=True)
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+            try:
+                raw = pool.submit(run_case, extractor, str(paths[name]), max(args.repeat, 1)).result()
+            except Exception as e:  # e.g. the worker was killed (OOM)
+                raw = {"error": f"{type(e).__name__}: {e}"}
+        results.append(summarize(case, paths[name], raw))
+
+    print()
+    print_report(results)
+
+    report = {
+        **git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nSaved {args.output}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text()), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="small,medium,large", help="comma-separated: small,medium,large")
+    parser.add_argument("--extractors", default="pdf,docx,excel,image", help="comma-separated: pdf,docx,excel,image")
+    parser.add_argument("--repeat", type=int, default=3, help="warm runs per file (after one cold run)")
+    parser.add_argument("--corpus-dir", default=None, help="where to generate/reuse the corpus (default: temp dir)")
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    parser.add_argument("--compare", default=None, help="previous JSON results to diff against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown counted as a regression")
+    sys.exit(main(parser.parse_args()))
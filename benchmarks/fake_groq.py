@@ -0,0 +1,162 @@
+"""
+Local stand-in for the Groq API (chat completions + Whisper transcriptions).
+
+Usage:
+    python -m benchmarks.fake_groq --port 8090 --llm-latency-ms 400
+
+Point the app at it with GROQ_BASE_URL / GROQ_API_BASE=http://127.0.0.1:8090.
+Chat requests that offer tools get one canned tool call first, then a canned
+answer once a tool result is in the conversation; requests without tools
+(analyzer nodes) get a canned JSON object. "stream": true is answered as SSE
+chunks. Media for load tests is served under /media/<name>.
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, Any
+from uuid import uuid4
+
+from aiohttp import web
+
+CANNED_ANSWER = (
+    "Thanks for your message. Based on our catalogue, the requested item is in stock "
+    "and can be delivered within three working days."
+)
+CANNED_JSON = {
+    "language": "english",
+    "should_continue": True,
+    "doc_category": "other",
+    "products": [],
+}
+CANNED_TRANSCRIPT = "Hello, do you have the steel pipes in stock and what is the price?"
+
+
+def _completion(model: str, message: Dict[str, Any], finish_reason: str) -> Dict[str, Any]:
+    return {
+        "id": f"chatcmpl-{uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+    }
+
+
+def _chunk(model: str, delta: Dict[str, Any], finish_reason: str = None) -> bytes:
+    body = {
+        "id": "chatcmpl-stream",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(body)}\n\n".encode("utf-8")
+
+
+def plan_reply(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Assistant message for a chat request: tool call, final answer or JSON"""
+    messages = body.get("messages", [])
+    tools = body.get("tools") or []
+    if tools and not any(m.get("role") == "tool" for m in messages):
+        query = next((m.get("content") for m in reversed(messages) if m.get("role") == "user"), "") or ""
+        query = query if isinstance(query, str) else json.dumps(query)
+        tool = tools[0]["function"]
+        arguments = {"query": query[:200]} if "query" in json.dumps(tool.get("parameters", {})) else {}
+        return {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [{
+                "id": f"call_{uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": tool["name"], "arguments": json.dumps(arguments)},
+            }],
+        }
+    if tools:
+        return {"role": "assistant", "content": CANNED_ANSWER}
+    return {"role": "assistant", "content": json.dumps(CANNED_JSON)}
+
+
+def create_app(llm_latency_ms: float = 300, stt_latency_ms: float = 500, media: Dict[str, bytes] = None) -> web.Application:
+    stats = {"chat": 0, "transcriptions": 0}
+
+    async def chat_completions(request: web.Request):
+        body = await request.json()
+        stats["chat"] += 1
+        model = body.get("model", "fake")
+        reply = plan_reply(body)
+        finish_reason = "tool_calls" if reply.get("tool_calls") else "stop"
+
+        if not body.get("stream"):
+            await asyncio.sleep(llm_latency_ms / 1000)
+            return web.json_response(_completion(model, reply, finish_reason))
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await asyncio.sleep(llm_latency_ms / 1000 / 2)  # time to first token
+        if reply.get("tool_calls"):
+            call = reply["tool_calls"][0]
+            await response.write(_chunk(model, {"role": "assistant", "tool_calls": [{"index": 0, **call}]}))
+        else:
+            words = reply["content"].split(" ")
+            for index, word in enumerate(words):
+                await response.write(_chunk(model, {"content": word if index == 0 else " " + word}))
+                await asyncio.sleep(llm_latency_ms / 1000 / 2 / len(words))
+        await response.write(_chunk(model, {}, finish_reason))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    async def transcriptions(request: web.Request):
+        reader = await request.multipart()
+        async for part in reader:
+            await part.read()  # drain the upload like the real API
+        stats["transcriptions"] += 1
+        await asyncio.sleep(stt_latency_ms / 1000)
+        return web.json_response({
+            "task": "transcribe",
+            "language": "english",
+            "duration": 5.0,
+            "text": CANNED_TRANSCRIPT,
+            "segments": [],
+        })
+
+    async def get_media(request: web.Request):
+        name = request.match_info["name"]
+        if not media or name not in media:
+            raise web.HTTPNotFound()
+        return web.Response(body=media[name])
+
+    async def get_stats(request: web.Request):
+        return web.json_response(stats)
+
+    app = web.Application(client_max_size=100 * 1024 * 1024)
+    app.router.add_post("/openai/v1/chat/completions", chat_completions)
+    app.router.add_post("/openai/v1/audio/transcriptions", transcriptions)
+    app.router.add_get("/media/{name}", get_media)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+async def start_server(port: int, **kwargs) -> web.AppRunner:
+    runner = web.AppRunner(create_app(**kwargs), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def main(args):
+    runner = await start_server(args.port, llm_latency_ms=args.llm_latency_ms, stt_latency_ms=args.stt_latency_ms)
+    print(f"Fake Groq listening on http://127.0.0.1:{args.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    parser.add_argument("--stt-latency-ms", type=float, default=500)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,79 @@
+"""
+Per-request graph/checkpointer overhead: per-request saver vs shared registry.
+
+Usage:
+    python -m benchmarks.graph_overhead --iterations 50
+
+Both paths read the state of a throwaway thread (no LLM call), so the numbers
+only contain checkpointer setup, graph compilation and one checkpoint read.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+if sys.platform.startswith("win"):
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+from src.core.settings import settings
+from src.agents.whatsapp_rag.graph import build_graph
+from src.utils.graph_registry import graph_manager
+
+CONFIG = {"configurable": {"thread_id": "benchmark_graph_overhead"}}
+
+
+async def per_request_saver():
+    """Old /chat/ path: new saver, DDL setup and graph compile on every request"""
+    async with AsyncPostgresSaver.from_conn_string(settings.PG_DATABASE_URL) as saver:
+        await saver.setup()
+        graph = await build_graph(checkpointer=saver)
+        await graph.aget_state(CONFIG)
+
+
+async def shared_registry():
+    """New /chat/ path: compiled graph and pooled checkpointer from the registry"""
+    graph = await graph_manager.get_graph("whatsapp_rag")
+    await graph.aget_state(CONFIG)
+
+
+async def measure(fn, iterations: int) -> list:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name: str, timings: list):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(
+        f"{name:<20} n={len(timings):<5} "
+        f"mean={statistics.mean(timings):8.2f}ms "
+        f"p50={statistics.median(timings):8.2f}ms "
+        f"p95={p95:8.2f}ms"
+    )
+
+
+async def main(iterations: int):
+    await graph_manager.connect()
+    try:
+        # warm both paths once so imports and first connections are not counted
+        await per_request_saver()
+        await shared_registry()
+
+        report("per-request saver", await measure(per_request_saver, iterations))
+        report("shared registry", await measure(shared_registry, iterations))
+    finally:
+        await graph_manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
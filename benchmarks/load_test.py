@@ -0,0 +1,344 @@
+"""
+/chat/ load test against local stand-ins for Groq, Qdrant and Postgres.
+
+Usage:
+    python -m benchmarks.load_test --requests 200 --concurrency 20 \
+        --mix text=70,voice=15,pdf=10,image=5 --route both --output load.json
+
+What runs where:
+- Groq chat + Whisper: benchmarks.fake_groq on a local port (canned tool
+  calls / answers / transcripts with configurable latency).
+- Qdrant: in-memory AsyncQdrantClient, seeded with synthetic passages.
+- Checkpointer: SQLite file by default, or --checkpointer postgres with
+  PG_DATABASE_URL pointing at a local Postgres.
+- Embeddings: the real models, or --fake-embeddings for hash vectors when the
+  models are not available offline.
+- The app: src.main:app served by uvicorn in this process. Startup mirrors the
+  lifespan minus the MSSQL client pool, the asyncpg pool and the scheduler,
+  which the chat path does not use.
+
+Every request is sent with "X-Timing: 1", so per-node and per-operation
+latencies come from the Server-Timing header of each response. Reports
+p50/p95/p99 and requests/s per route and message kind, and p50/p95/p99
+per graph node / operation.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Any
+
+from benchmarks.corpus import make_wav, make_text_pdf, make_png, sentence
+from benchmarks.env import apply_offline_defaults
+
+KINDS = ("text", "voice", "pdf", "image")
+MEDIA = {"voice": "voice.wav", "pdf": "catalogue.pdf", "image": "price_list.png"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def configure_env(args, groq_url: str, workdir: Path):
+    """Point the settings at the stand-ins; must run before anything from src is imported"""
+    apply_offline_defaults()
+    os.environ.update({
+        "GROQ_BASE_URL": groq_url,  # groq SDK (transcription)
+        "GROQ_API_BASE": groq_url,  # langchain_groq ChatGroq
+        "QDRANT_URL": "http://unused:6333",  # replaced by an in-memory client
+        "CHECKPOINTER_BACKEND": args.checkpointer,
+        "CHECKPOINTER_SQLITE_PATH": str(workdir / "checkpoints.sqlite"),
+        "DATA_DIR": str(workdir / "media"),
+        "TRANSCRIPTION_BACKEND": "groq",
+        "AUDIO_PREPROCESS": "true" if args.preprocess_audio else "false",
+        "ANSWER_CACHE_ENABLED": "true" if args.answer_cache else "false",
+        "TIMING_HEADER": "false",
+    })
+
+
+class HashEncoder:
+    """Deterministic stand-in for a SentenceTransformer (normalized hash vectors)"""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def encode(self, texts, **kwargs):
+        import numpy as np
+        vectors = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+            vector = np.random.default_rng(seed).standard_normal(self.dim).astype("float32")
+            vectors.append(vector / np.linalg.norm(vector))
+        return np.stack(vectors)
+
+
+async def start_services(args):
+    """Bring up the app's process-wide services against the stand-ins"""
+    from qdrant_client import AsyncQdrantClient
+    from qdrant_client.http.models import PointStruct
+
+    from src.core.model_registry import model_registry
+    from src.utils.qdrant_db import qdrant_manager
+    from src.agents.whatsapp_rag.qdrant_client import qdrant_manager as qdrant_manager_rag
+    from src.agents.whatsapp_rag.settings import settings as rag_settings
+    from src.agents.whatsapp_rag.embeddings import embed_passages_bulk
+    from src.agents.whatsapp_rag.ingest import point_id
+    from src.utils.graph_registry import graph_manager
+    from src.utils.file_handler import http_manager
+    from src.utils.job_queue import job_queue
+    from src.core.transcription import transcriber
+
+    if args.fake_embeddings:
+        model_registry.register("minilm", lambda: HashEncoder(384))
+        model_registry.register("e5-large", lambda: HashEncoder(rag_settings.VECTOR_SIZE))
+
+    # In-memory Qdrant for both managers
+    qdrant_manager._client = AsyncQdrantClient(location=":memory:")
+    for name, cfg in qdrant_manager.collections_config.items():
+        await qdrant_manager._ensure_collection(name, cfg["dim"], cfg["distance"])
+    qdrant_manager_rag._client = AsyncQdrantClient(location=":memory:")
+    for name in (rag_settings.COLLECTION_NAME, rag_settings.ANSWER_CACHE_COLLECTION):
+        await qdrant_manager_rag._ensure_collection(name, rag_settings.VECTOR_SIZE, rag_settings.DISTANCE)
+
+    # Seed the RAG collection so vector_search returns real payloads
+    rng = random.Random(args.seed)
+    passages = [" ".join(sentence(rng) for _ in range(5)) for _ in range(args.passages)]
+    vectors = await embed_passages_bulk(passages)
+    await qdrant_manager_rag.upsert_points(
+        [
+            PointStruct(id=point_id("bench", i), vector=vector, payload={"text": text, "source": "bench", "chunk_index": i})
+            for i, (text, vector) in enumerate(zip(passages, vectors))
+        ],
+        collection_name=rag_settings.COLLECTION_NAME,
+    )
+
+    await http_manager.connect()
+    await graph_manager.connect()
+    await graph_manager.warm_up()
+    await transcriber.connect()
+    await job_queue.start()
+
+
+async def stop_services():
+    from src.utils.graph_registry import graph_manager
+    from src.utils.file_handler import http_manager
+    from src.utils.job_queue import job_queue
+    from src.core.transcription import transcriber
+    from src.utils.helpers import close_chat_clients
+
+    await job_queue.stop()
+    await transcriber.close()
+    await close_chat_clients()
+    await http_manager.close()
+    await graph_manager.close()
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """'name;dur=12.3, other;dur=4' -> {name: ms}"""
+    timings = {}
+    for entry in filter(None, (part.strip() for part in (header or "").split(","))):
+        name, _, params = entry.partition(";")
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "dur":
+                timings[name.strip()] = float(value)
+    return timings
+
+
+def build_plan(args) -> List[Dict[str, Any]]:
+    weights = dict(item.split("=") for item in args.mix.split(","))
+    kinds = [kind for kind in KINDS if kind in weights]
+    rng = random.Random(args.seed)
+    routes = ["chat", "chat_stream"] if args.route == "both" else [args.route]
+    return [
+        {
+            "index": i,
+            "route": routes[i % len(routes)],
+            "kind": rng.choices(kinds, weights=[float(weights[k]) for k in kinds])[0],
+            "user_id": f"bench-{i % args.users}",
+            "message": sentence(rng, 10),
+        }
+        for i in range(args.requests)
+    ]
+
+
+async def send(session, app_url: str, groq_url: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    params = {"user_id": item["user_id"], "name": "Bench"}
+    if item["kind"] == "text":
+        params["message"] = item["message"]
+    else:
+        params["file"] = f"{groq_url}/media/{MEDIA[item['kind']]}"
+        if item["kind"] != "voice":
+            params["message"] = "What is in this file?"
+
+    path = "/chat/stream/" if item["route"] == "chat_stream" else "/chat/"
+    result = {"route": item["route"], "kind": item["kind"], "ok": False, "ttfb_ms": None}
+    start = time.perf_counter()
+    try:
+        async with session.post(app_url + path, params=params, headers={"X-Timing": "1"}) as response:
+            if item["route"] == "chat_stream":
+                async for line in response.content:
+                    if result["ttfb_ms"] is None and line.startswith(b"event: token"):
+                        result["ttfb_ms"] = (time.perf_counter() - start) * 1000
+                    if line.startswith(b"event: done"):
+                        result["ok"] = True
+            else:
+                body = await response.json()
+                result["ok"] = response.status == 200 and "status" not in body
+            result["timings"] = parse_server_timing(response.headers.get("Server-Timing"))
+    except Exception as e:
+        result["error"] = str(e)
+    result["latency_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile"""
+    values = sorted(values)
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "n": len(values),
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+    }
+
+
+def report(results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    by_route = defaultdict(list)
+    for result in results:
+        by_route[(result["route"], result["kind"])].append(result)
+
+    routes = {}
+    for (route, kind), items in sorted(by_route.items()):
+        entry = summarize([r["latency_ms"] for r in items])
+        entry["errors"] = sum(1 for r in items if not r["ok"])
+        entry["requests_per_sec"] = round(len(items) / elapsed, 2)
+        ttfb = [r["ttfb_ms"] for r in items if r["ttfb_ms"] is not None]
+        if ttfb:
+            entry["ttfb"] = summarize(ttfb)
+        routes[f"{route}:{kind}"] = entry
+
+    # Server-Timing of streamed responses is sent with the headers, i.e. before the graph ran
+    node_timings = defaultdict(list)
+    for result in results:
+        if result["route"] == "chat":
+            for name, ms in result.get("timings", {}).items():
+                node_timings[name].append(ms)
+    nodes = {name: summarize(values) for name, values in sorted(node_timings.items())}
+
+    return {
+        "requests": len(results),
+        "errors": sum(1 for r in results if not r["ok"]),
+        "seconds": round(elapsed, 2),
+        "requests_per_sec": round(len(results) / elapsed, 2),
+        "routes": routes,
+        "nodes": nodes,
+    }
+
+
+def print_report(summary: Dict[str, Any]):
+    print(f"{summary['requests']} requests in {summary['seconds']}s ({summary['requests_per_sec']} req/s, {summary['errors']} errors)")
+    print(f"\n{'route:kind':<22} {'n':>5} {'err':>4} {'req/s':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'ttfb p50':>9}")
+    for name, entry in summary["routes"].items():
+        ttfb = entry.get("ttfb", {}).get("p50")
+        print(
+            f"{name:<22} {entry['n']:>5} {entry['errors']:>4} {entry['requests_per_sec']:>7} "
+            f"{entry['p50']:>9} {entry['p95']:>9} {entry['p99']:>9} {ttfb if ttfb is not None else '-':>9}"
+        )
+    print(f"\n{'node / operation (ms)':<45} {'n':>5} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, entry in summary["nodes"].items():
+        print(f"{name:<45} {entry['n']:>5} {entry['p50']:>9} {entry['p95']:>9} {entry['p99']:>9}")
+
+
+async def main(args):
+    import aiohttp
+    import uvicorn
+    from benchmarks.fake_groq import start_server
+
+    workdir = Path(tempfile.mkdtemp(prefix="whatsapp_load_"))
+    groq_port = free_port()
+    groq_url = f"http://127.0.0.1:{groq_port}"
+    configure_env(args, groq_url, workdir)
+
+    media = {
+        MEDIA["voice"]: make_wav(seconds=args.voice_seconds, seed=args.seed),
+        MEDIA["pdf"]: make_text_pdf(pages=args.pdf_pages, seed=args.seed),
+        MEDIA["image"]: make_png(seed=args.seed),
+    }
+    groq_runner = await start_server(groq_port, llm_latency_ms=args.llm_latency_ms, stt_latency_ms=args.stt_latency_ms, media=media)
+
+    from src.main import app
+    await start_services(args)
+
+    app_port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=app_port, lifespan="off", log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    plan = build_plan(args)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    try:
+        connector = aiohttp.TCPConnector(limit=args.concurrency)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=600)) as session:
+            async def _run(item):
+                async with semaphore:
+                    return await send(session, f"http://127.0.0.1:{app_port}", groq_url, item)
+
+            # warm-up: loads models and opens connections outside the measurement
+            await asyncio.gather(*(_run(dict(item, index=-1)) for item in plan[:min(len(plan), 4)]))
+
+            start = time.perf_counter()
+            results = await asyncio.gather(*(_run(item) for item in plan))
+            elapsed = time.perf_counter() - start
+    finally:
+        server.should_exit = True
+        await server_task
+        await stop_services()
+        await groq_runner.cleanup()
+
+    summary = report(results, elapsed)
+    summary["config"] = {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()}
+    print_report(summary)
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2))
+        print(f"\nSaved {args.output}")
+
+
+if __name__ == "__main__":
+    if sys.platform.startswith("win"):
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--users", type=int, default=50, help="distinct user ids (threads)")
+    parser.add_argument("--mix", default="text=70,voice=15,pdf=10,image=5", help="message kind weights")
+    parser.add_argument("--route", choices=("chat", "chat_stream", "both"), default="chat")
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    parser.add_argument("--stt-latency-ms", type=float, default=500)
+    parser.add_argument("--voice-seconds", type=float, default=8.0)
+    parser.add_argument("--pdf-pages", type=int, default=3)
+    parser.add_argument("--passages", type=int, default=200, help="synthetic passages seeded into the RAG collection")
+    parser.add_argument("--checkpointer", choices=("sqlite", "postgres"), default="sqlite")
+    parser.add_argument("--fake-embeddings", action="store_true", help="hash vectors instead of the embedding models")
+    parser.add_argument("--preprocess-audio", action="store_true", help="enable ffmpeg audio preprocessing")
+    parser.add_argument("--answer-cache", action="store_true", help="enable the semantic answer cache")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write the summary as JSON")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,71 @@
+"""
+Archive throughput of AsyncQdrantManager.save_messages over synthetic threads.
+
+Usage:
+    python -m benchmarks.save_messages --sizes 10 100 1000
+
+Runs against an in-memory Qdrant collection so only embedding and upsert
+overhead is measured. "sequential" reproduces the old per-message embed loop,
+"batched" is the current save_messages/save_threads path.
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from langchain_core.messages import HumanMessage, AIMessage
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import PointStruct
+
+from src.utils.qdrant_db import qdrant_manager
+
+COLLECTION = "whatsapp_agent"
+
+
+def synthetic_thread(size: int) -> list:
+    messages = []
+    for i in range(size):
+        if i % 2 == 0:
+            messages.append(HumanMessage(content=f"Do you have product {i} in stock? I need {i % 7 + 1} units."))
+        else:
+            messages.append(AIMessage(content=f"Yes, product {i - 1} is available, {i * 3} units in the warehouse."))
+    return messages
+
+
+async def sequential(messages: list):
+    """Previous implementation: one encode per message, single upsert"""
+    cfg = qdrant_manager.collections_config[COLLECTION]
+    points = []
+    for msg in messages:
+        vector = await cfg["embed_fn"](msg.content)
+        points.append(PointStruct(id=str(uuid4()), vector=vector, payload={"content": msg.content}))
+    await qdrant_manager._client.upsert(collection_name=COLLECTION, points=points)
+
+
+async def batched(messages: list):
+    await qdrant_manager.save_messages(user_id="bench", thread_id="bench_thread", messages=messages)
+
+
+async def main(sizes: list):
+    # Point the singleton at an in-memory Qdrant instead of the configured server
+    qdrant_manager._client = AsyncQdrantClient(location=":memory:")
+    for name, cfg in qdrant_manager.collections_config.items():
+        await qdrant_manager._ensure_collection(name, cfg["dim"], cfg["distance"])
+
+    # warm up model and batcher
+    await batched(synthetic_thread(4))
+
+    for size in sizes:
+        messages = synthetic_thread(size)
+        for name, fn in (("sequential", sequential), ("batched", batched)):
+            start = time.perf_counter()
+            await fn(messages)
+            elapsed = time.perf_counter() - start
+            print(f"{size:>6} msgs  {name:<10} {elapsed * 1000:10.1f}ms  {size / elapsed:10.1f} msg/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes))
@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from src.core.settings import settings
+from src.utils.db import checkpoint_db
+from src.core.logging_config import get_logger
+logger = get_logger(__name__)
+
+
+CACHE_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS doc_extraction_cache (
+        key VARCHAR(255) PRIMARY KEY,
+        value JSONB NOT NULL,
+        size_bytes INTEGER NOT NULL,
+        accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """
+
+# Keep most recently used rows until their cumulative size exceeds the limit
+EVICT_QUERY = """
+    DELETE FROM doc_extraction_cache WHERE key IN (
+        SELECT key FROM (
+            SELECT key, SUM(size_bytes) OVER (ORDER BY accessed_at DESC, key) AS running
+            FROM doc_extraction_cache
+        ) ranked
+        WHERE running > $1
+    )
+    """
+
+
+def file_sha256(path: str, block_size: int = 1024 * 1024) -> str:
+    """Content hash of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Content-addressed cache for parser/analyzer results.
+    - Keys are "<namespace>:<content sha256>"; namespaces embed a version so
+      changing the extractor or analyzer prompt invalidates old entries.
+    - Backend "disk": one JSON file per entry under `cache_dir`, LRU by mtime.
+    - Backend "postgres": doc_extraction_cache table in the checkpoint database.
+    - Both evict least recently used entries once `max_bytes` is exceeded.
+    """
+
+    def __init__(self, **kwargs):
+        self.enabled = kwargs.get('enabled', True)
+        self.backend = kwargs.get('backend', "disk")
+        self.cache_dir = Path(kwargs.get('cache_dir', "cache/documents"))
+        self.max_bytes = kwargs.get('max_bytes', 256 * 1024 * 1024)
+
+        self._disk_lock = threading.Lock()
+        self._disk_size: Optional[int] = None
+        self._table_ready = False
+
+        # metrics
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------ DISK ------------------
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # mark as recently used
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def _disk_put(self, key: str, value: Dict[str, Any]):
+        body = json.dumps(value).encode("utf-8")
+        path = self._path(key)
+        with self._disk_lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if self._disk_size is None:
+                self._disk_size = sum(p.stat().st_size for p in self.cache_dir.glob("*.json"))
+            if path.exists():
+                self._disk_size -= path.stat().st_size
+
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, path)
+            self._disk_size += len(body)
+
+            if self._disk_size > self.max_bytes:
+                self._disk_evict()
+
+    def _disk_evict(self):
+        """Delete least recently used files until under 90% of max_bytes"""
+        files = sorted(self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        target = int(self.max_bytes * 0.9)
+        for path in files:
+            if self._disk_size <= target:
+                break
+            try:
+                size = path.stat().st_size
+                path.unlink()
+                self._disk_size -= size
+            except OSError:
+                continue
+
+    # ------------------ POSTGRES ------------------
+    async def _pg_ready(self):
+        if not self._table_ready:
+            async with checkpoint_db.get_connection() as conn:
+                await conn.execute(CACHE_TABLE_QUERY)
+            self._table_ready = True
+
+    async def _pg_get(self, key: str) -> Optional[Dict[str, Any]]:
+        await self._pg_ready()
+        async with checkpoint_db.get_connection() as conn:
+            value = await conn.fetchval(
+                """
+                UPDATE doc_extraction_cache SET accessed_at = NOW()
+                WHERE key = $1 RETURNING value::text
+                """,
+                key
+            )
+        return json.loads(value) if value is not None else None
+
+    async def _pg_put(self, key: str, value: Dict[str, Any]):
+        await self._pg_ready()
+        body = json.dumps(value)
+        async with checkpoint_db.transaction() as conn:
+            await conn.execute(
+                """
+                INSERT INTO doc_extraction_cache (key, value, size_bytes, accessed_at)
+                VALUES ($1, $2::jsonb, $3, NOW())
+                ON CONFLICT (key)
+                DO UPDATE SET value = EXCLUDED.value, size_bytes = EXCLUDED.size_bytes, accessed_at = NOW()
+                """,
+                key,
+                body,
+                len(body.encode("utf-8"))
+            )
+            await conn.execute(EVICT_QUERY, self.max_bytes)
+
+    # ------------------ API ------------------
+    async def get(self, namespace: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled or not content_hash:
+            return None
+        key = f"{namespace}:{content_hash}"
+        try:
+            if self.backend == "postgres":
+                value = await self._pg_get(key)
+            else:
+                value = await asyncio.to_thread(self._disk_get, key)
+        except Exception as e:
+            logger.error(f"Extraction cache read failed: {e}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            logger.info(f"Extraction cache hit for {namespace}")
+        return value
+
+    async def put(self, namespace: str, content_hash: str, value: Dict[str, Any]):
+        if not self.enabled or not content_hash:
+            return
+        key = f"{namespace}:{content_hash}"
+        try:
+            if self.backend == "postgres":
+                await self._pg_put(key, value)
+            else:
+                await asyncio.to_thread(self._disk_put, key, value)
+        except Exception as e:
+            logger.error(f"Extraction cache write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "disk_bytes": self._disk_size,
+        }
+
+
+# Singleton cache
+extraction_cache = ExtractionCache(
+    enabled=settings.DOC_CACHE_ENABLED,
+    backend=settings.DOC_CACHE_BACKEND,
+    cache_dir=settings.DOC_CACHE_DIR,
+    max_bytes=settings.DOC_CACHE_MAX_BYTES,
+)
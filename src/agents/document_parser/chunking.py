@@ -0,0 +1,129 @@
+import re
+from typing import Dict, List
+
+from src.agents.document_parser.tokens import estimate_tokens
+
+PAGE_BREAK = "\f"  # extract_pdf_text separates pages with a form feed
+
+# Lines that start a table: "[Table n]" (docx) or "[Sheet <name>]" (excel table format).
+# Markdown "#" headings are plain section boundaries, never repeated as table headers.
+_TABLE_START = re.compile(r"^\[(Table \d+|Sheet .+)\]$")
+
+
+def _sections(page: str) -> List[str]:
+    """Split a page at blank lines and table starts (tables have no blank lines inside)"""
+    sections, current = [], []
+    for line in page.split("\n"):
+        if not line.strip() or _TABLE_START.match(line):
+            if current:
+                sections.append("\n".join(current))
+            current = []
+        if line.strip():
+            current.append(line)
+    if current:
+        sections.append("\n".join(current))
+    return sections
+
+
+def _split_lines(section: str, max_tokens: int) -> List[str]:
+    """Split an oversized section by lines; table pieces repeat the marker + header row"""
+    lines = section.split("\n")
+    repeat = lines[:2] if _TABLE_START.match(lines[0]) else []
+    body = lines[len(repeat):]
+    budget = max(max_tokens - estimate_tokens("\n".join(repeat)), 1)
+
+    pieces, current, size = [], [], 0
+    for line in body:
+        tokens = estimate_tokens(line) + 1
+        if tokens > budget:  # a single huge line: hard split by characters
+            chars = max(int(len(line) * budget / tokens), 1)
+            parts = [line[i:i + chars] for i in range(0, len(line), chars)]
+        else:
+            parts = [line]
+        for part in parts:
+            part_tokens = estimate_tokens(part) + 1
+            if current and size + part_tokens > budget:
+                pieces.append("\n".join(repeat + current))
+                current, size = [], 0
+            current.append(part)
+            size += part_tokens
+    if current:
+        pieces.append("\n".join(repeat + current))
+    return pieces
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """Greedy-pack pages/sections into chunks of at most ~max_tokens.
+
+    Boundaries are preferred in this order: page breaks, tables and blank-line
+    paragraphs, then single lines.
+    """
+    units: List[str] = []
+    for page in text.split(PAGE_BREAK):
+        page = page.strip("\n")
+        if not page.strip():
+            continue
+        if estimate_tokens(page) <= max_tokens:
+            units.append(page)
+            continue
+        for section in _sections(page):
+            if estimate_tokens(section) <= max_tokens:
+                units.append(section)
+            else:
+                units.extend(_split_lines(section, max_tokens))
+
+    chunks, current, size = [], [], 0
+    for unit in units:
+        tokens = estimate_tokens(unit) + 2
+        if current and size + tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(unit)
+        size += tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _product_key(product: Dict) -> str:
+    return " ".join(str(product.get("name") or "").casefold().split())
+
+
+def merge_analyses(results: List[Dict]) -> Dict:
+    """Reduce per-chunk analyzer outputs into one document analysis.
+
+    Products are deduplicated by normalized name (missing quantity/details are
+    filled from later duplicates); the document continues if any chunk says
+    so, and the category is the most common one among those chunks.
+    """
+    products: Dict[str, Dict] = {}
+    for result in results:
+        for product in result.get("products") or []:
+            if not isinstance(product, dict):
+                continue
+            key = _product_key(product)
+            if not key:
+                continue
+            if key not in products:
+                products[key] = dict(product)
+                continue
+            merged = products[key]
+            for field, value in product.items():
+                if merged.get(field) in (None, "", "null") and value not in (None, "", "null"):
+                    merged[field] = value
+
+    relevant = [result for result in results if result.get("should_continue")]
+    categories = [
+        result.get("doc_category") for result in (relevant or results)
+        if result.get("doc_category") not in (None, "", "null")
+    ]
+    analysis = {
+        "doc_category": max(categories, key=categories.count) if categories else None,
+        "should_continue": bool(relevant),
+        "products": list(products.values()),
+    }
+    if not relevant:
+        response = next((result["response"] for result in results if result.get("response")), None)
+        if response:
+            analysis["response"] = response
+    return analysis
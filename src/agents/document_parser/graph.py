@@ -6,6 +6,7 @@ from src.agents.document_parser.nodes import (
 )
 
 from src.agents.document_parser.state import State
+from src.core.metrics import timed_node
 
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
@@ -15,8 +16,8 @@ async def document_parser_graph() -> StateGraph:
     graph_builder = StateGraph(State)
 
     # Add all nodes
-    graph_builder.add_node("ParserNode", parser_agent)
-    graph_builder.add_node("DocAnalyzerNode", doc_analyzer_node)
+    graph_builder.add_node("ParserNode", timed_node("document_parser", "ParserNode", parser_agent))
+    graph_builder.add_node("DocAnalyzerNode", timed_node("document_parser", "DocAnalyzerNode", doc_analyzer_node))
 
     # Define workflow
     graph_builder.add_edge(START, "ParserNode")
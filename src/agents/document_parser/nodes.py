@@ -1,6 +1,7 @@
 import os
 import json
 import asyncio
+import hashlib
 
 from langchain_core.messages import SystemMessage, HumanMessage
 
@@ -13,15 +14,36 @@ from src.agents.document_parser.tools import (
     )
 from src.agents.document_parser.prompts import (
      DOC_ANALYZER_SYSTEM_PROMPT,
-     DOC_ANALYZER_HUMAN_PROMPT
+     DOC_ANALYZER_HUMAN_PROMPT,
+     DOC_ANALYZER_CHUNK_PROMPT
+)
+from src.agents.document_parser.chunking import (
+    chunk_text,
+    merge_analyses
+)
+from src.agents.document_parser.cache import (
+    extraction_cache,
+    file_sha256
 )
 from src.utils.helpers import (
     get_chat_model
 )
+from src.utils.job_queue import job_queue
+from src.core.metrics import timer
+from src.core.settings import settings
 
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
 
+# Cache namespaces: a prompt/model change gives the analyzer a new namespace
+EXTRACTION_CACHE_NAMESPACE = f"text-v{settings.DOC_CACHE_VERSION}"
+ANALYSIS_CACHE_NAMESPACE = "analysis-" + hashlib.sha256(
+    f"{settings.DOC_CACHE_VERSION}|{settings.OPENAI_GPT_120}|{DOC_ANALYZER_SYSTEM_PROMPT}|{DOC_ANALYZER_HUMAN_PROMPT}"
+    f"|{DOC_ANALYZER_CHUNK_PROMPT}|{settings.DOC_CHUNK_TOKENS}".encode("utf-8")
+).hexdigest()[:16]
+# Per-chunk results, keyed by the chunk's own hash, so a retry only re-runs failed chunks
+CHUNK_CACHE_NAMESPACE = ANALYSIS_CACHE_NAMESPACE.replace("analysis-", "analysis-chunk-", 1)
+
 # Helper function
 def get_extractor(filepath: str):
         """Get appropriate extractor based on file type"""
@@ -57,10 +79,24 @@ async def parser_agent(state: State) -> State:
             return state
         
         try:
-            result = await asyncio.to_thread(
-                extractor,
-                input_path=file_path
-            )
+            # Same content (e.g. a forwarded catalogue) -> reuse the earlier extraction
+            file_hash = state.get("file_hash") or await asyncio.to_thread(file_sha256, file_path)
+            state["file_hash"] = file_hash
+
+            result = await extraction_cache.get(EXTRACTION_CACHE_NAMESPACE, file_hash)
+            if result is None:
+                # Bounded "ocr" pool keeps bursts of documents off the default executor
+                with timer(f"extract.{extractor.__name__}"):
+                    result = await job_queue.run_sync(
+                        "ocr",
+                        extractor,
+                        input_path=file_path
+                    )
+                await extraction_cache.put(
+                    EXTRACTION_CACHE_NAMESPACE,
+                    file_hash,
+                    {"text": result.get("text"), "method": result.get("method")}
+                )
 
             # Update the existing state object instead of returning a new one
             state["doc_text"] = result.get("text")
@@ -77,39 +113,88 @@ async def parser_agent(state: State) -> State:
             state["extraction_status"] = "failed"
             return state
         
-async def doc_analyzer_node(state: State) -> State:
-    """Analyze extracted document text and summarize key points."""
-    logger.info("Starting Document Analyzer Node.")
-
-    doc_text = state.get("doc_text")
-    if not doc_text:
-        logger.warning("No document text available for analysis.")
-        return state
-    
-    model = get_chat_model()
-
+async def analyze_chunk(chunk: str, part: int, parts: int, semaphore: asyncio.Semaphore) -> dict:
+    """Product extraction for one chunk (map step), cached by chunk content"""
+    # A single-chunk document is covered by the whole-document cache entry
+    chunk_hash = hashlib.sha256(chunk.encode("utf-8")).hexdigest() if parts > 1 else None
+    cached = await extraction_cache.get(CHUNK_CACHE_NAMESPACE, chunk_hash)
+    if cached is not None:
+        return cached
+
+    if parts == 1:
+        prompt = DOC_ANALYZER_HUMAN_PROMPT.format(doc_text=chunk)
+    else:
+        prompt = DOC_ANALYZER_CHUNK_PROMPT.format(doc_text=chunk, part=part, parts=parts)
     messages = [
          SystemMessage(content=DOC_ANALYZER_SYSTEM_PROMPT),
-         HumanMessage(content=DOC_ANALYZER_HUMAN_PROMPT.format(doc_text=doc_text)),
+         HumanMessage(content=prompt),
     ]
 
-    try:
-        # call LLM
-        response = await model.ainvoke(messages)
-    except Exception as e:
-        logger.error(f"Error in doc_analyzer_node LLM call: {e}")
+    model = get_chat_model()
+    async with semaphore:
+        response = await job_queue.run("llm", lambda: model.ainvoke(messages))
 
     try:
-        # Parse JSON response
         content = json.loads(response.content)
     except json.JSONDecodeError as e:
         raise RuntimeError(f"Error parsing JSON response in doc_analyzer_node: {e}")
-    
-    state['doc_category'] = content.get("doc_category")
-    state['should_continue'] = content.get("should_continue")
-    state['products'] = content.get("products", [])
+
+    result = {
+        "doc_category": content.get("doc_category"),
+        "should_continue": content.get("should_continue"),
+        "products": content.get("products", []),
+    }
     if content.get("response"):
-        state["response"] = content.get("response", "")
+        result["response"] = content.get("response", "")
+    await extraction_cache.put(CHUNK_CACHE_NAMESPACE, chunk_hash, result)
+    return result
+
+
+async def doc_analyzer_node(state: State) -> State:
+    """Analyze extracted document text and summarize key points."""
+    logger.info("Starting Document Analyzer Node.")
+
+    doc_text = state.get("doc_text")
+    if not doc_text:
+        logger.warning("No document text available for analysis.")
+        return state
+
+    content_hash = state.get("file_hash") or hashlib.sha256(doc_text.encode("utf-8")).hexdigest()
+    cached = await extraction_cache.get(ANALYSIS_CACHE_NAMESPACE, content_hash)
+    if cached is not None:
+        state.update(cached)
+        logger.info("Document analysis served from cache.")
+        return state
+
+    chunks = chunk_text(doc_text, settings.DOC_CHUNK_TOKENS)
+    if not chunks:
+        logger.warning("No document text available for analysis.")
+        return state
+    if len(chunks) > settings.DOC_MAX_CHUNKS:
+        logger.warning(f"Document has {len(chunks)} chunks, analyzing the first {settings.DOC_MAX_CHUNKS}")
+        chunks = chunks[:settings.DOC_MAX_CHUNKS]
+    if len(chunks) > 1:
+        logger.info(f"Analyzing document in {len(chunks)} chunks")
+
+    # Chunks of this document in flight; the "llm" job pool bounds LLM calls overall
+    semaphore = asyncio.Semaphore(settings.DOC_CHUNK_CONCURRENCY)
+    results = await asyncio.gather(*(
+        analyze_chunk(chunk, index + 1, len(chunks), semaphore)
+        for index, chunk in enumerate(chunks)
+    ), return_exceptions=True)
+
+    failed = [result for result in results if isinstance(result, Exception)]
+    succeeded = [result for result in results if not isinstance(result, Exception)]
+    for error in failed:
+        logger.error(f"Error in doc_analyzer_node chunk analysis: {error}")
+    if not succeeded:
+        raise RuntimeError(f"Document analysis failed for all {len(chunks)} chunks: {failed[0]}")
+
+    analysis = merge_analyses(succeeded)
+    state.update(analysis)
+    # A partial result is returned but not cached; its successful chunks are
+    if not failed:
+        await extraction_cache.put(ANALYSIS_CACHE_NAMESPACE, content_hash, analysis)
 
     logger.info("Document analysis completed successfully.")
     return state
\ No newline at end of file
@@ -52,4 +52,8 @@ DOC_ANALYZER_SYSTEM_PROMPT = """
 
 DOC_ANALYZER_HUMAN_PROMPT = """Extract product information from this document:
 
-{doc_text}"""
\ No newline at end of file
+{doc_text}"""
+
+DOC_ANALYZER_CHUNK_PROMPT = """Extract product information from this document (part {part} of {parts}):
+
+{doc_text}"""
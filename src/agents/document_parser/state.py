@@ -2,9 +2,11 @@ from typing import TypedDict, List
 
 class State(TypedDict):
     file_path: str
+    file_hash: str
     extraction_method: str
     extraction_status: str
     doc_text: str
     doc_category: str
     products: List[dict]
-    should_continue: bool
\ No newline at end of file
+    should_continue: bool
+    response: str
\ No newline at end of file
@@ -0,0 +1,10 @@
+import math
+
+from src.core.settings import settings
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (no tokenizer for the Groq models is available locally)"""
+    if not text:
+        return 0
+    return math.ceil(len(text) / settings.DOC_CHARS_PER_TOKEN)
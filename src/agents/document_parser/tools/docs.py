@@ -1,19 +1,122 @@
 from docx import Document
-from typing import Dict
-from pathlib import Path
+from docx.table import Table
+from typing import Dict, List
 
 from langsmith import traceable
 
+from src.agents.document_parser.tokens import estimate_tokens
+from src.core.settings import settings
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
 
+# Block priorities: in budget mode the highest number is dropped first
+HEADING, TABLE_ROW, PARAGRAPH, PAGE_HEADER = 0, 1, 2, 3
+
+
+def _row_cells(row) -> List[str]:
+    """Cell texts of a table row; horizontally merged cells are reported once"""
+    cells, previous = [], None
+    for cell in row.cells:
+        if previous is not None and cell._tc is previous._tc:
+            continue
+        previous = cell
+        cells.append(" ".join(cell.text.split()))
+    while cells and not cells[-1]:
+        cells.pop()
+    return cells
+
+
+def _table_blocks(table: Table, number: int) -> List[Dict]:
+    """One block per row: "[Table n]" and the first (header) row are kept in budget mode"""
+    blocks = [{"priority": HEADING, "text": f"[Table {number}]", "table": number}]
+    for index, row in enumerate(table.rows):
+        cells = _row_cells(row)
+        if any(cells):
+            blocks.append({"priority": HEADING if index == 0 else TABLE_ROW, "text": " | ".join(cells)})
+    return blocks
+
+
+def _paragraph_block(paragraph) -> Dict:
+    text = paragraph.text.strip()
+    if not text:
+        return None
+    style = (paragraph.style.name if paragraph.style is not None else "") or ""
+    if style == "Title":
+        return {"priority": HEADING, "text": f"# {text}"}
+    if style.startswith("Heading"):
+        level = style.rsplit(" ", 1)[-1]
+        return {"priority": HEADING, "text": "#" * (int(level) if level.isdigit() else 1) + f" {text}"}
+    if style.startswith("List"):
+        return {"priority": PARAGRAPH, "text": f"- {text}"}
+    return {"priority": PARAGRAPH, "text": text}
+
+
+def docx_blocks(input_path: str) -> List[Dict]:
+    """Body paragraphs and tables in document order, plus section header/footer text"""
+    doc = Document(input_path)
+    blocks: List[Dict] = []
+
+    seen = set()
+    for section in doc.sections:
+        for part in (section.header, section.footer):
+            if part.is_linked_to_previous:
+                continue
+            text = " ".join(p.text.strip() for p in part.paragraphs if p.text.strip())
+            if text and text not in seen:
+                seen.add(text)
+                blocks.append({"priority": PAGE_HEADER, "text": text})
+
+    tables = 0
+    for item in doc.iter_inner_content():
+        if isinstance(item, Table):
+            tables += 1
+            blocks.extend(_table_blocks(item, tables))
+        else:
+            block = _paragraph_block(item)
+            if block:
+                blocks.append(block)
+    return blocks
+
+
+def apply_token_budget(blocks: List[Dict], max_tokens: int) -> List[Dict]:
+    """Drop blocks until the estimate fits: page headers/footers, then paragraphs,
+    then table rows, each from the end of the document; headings and table header
+    rows are always kept. Order of the remaining blocks is unchanged."""
+    for block in blocks:
+        block["tokens"] = estimate_tokens(block["text"]) + 1  # + newline
+    total = sum(block["tokens"] for block in blocks)
+
+    dropped = set()
+    for priority in (PAGE_HEADER, PARAGRAPH, TABLE_ROW):
+        for index in range(len(blocks) - 1, -1, -1):
+            if total <= max_tokens:
+                break
+            if blocks[index]["priority"] == priority:
+                dropped.add(index)
+                total -= blocks[index]["tokens"]
+    return [block for index, block in enumerate(blocks) if index not in dropped]
+
+
 @traceable(name="Docx Parser")
-def extract_docx_text(input_path: str) -> Dict:
-    """Extract text from DOCX files"""
+def extract_docx_text(input_path: str, max_tokens: int = None) -> Dict:
+    """Extract text and tables from DOCX files.
+
+    Tables are written row by row ("cell | cell") where they appear in the
+    body, headings as "#" lines. With a token budget (max_tokens, default
+    DOCX_TOKEN_BUDGET; 0 disables) low-value blocks are dropped first.
+    """
     logger.info(f"Extracting docx file...")
+    max_tokens = settings.DOCX_TOKEN_BUDGET if max_tokens is None else max_tokens
     try:
-        doc = Document(input_path)
-        text = "\n".join([para.text for para in doc.paragraphs])
+        blocks = docx_blocks(input_path)
+        total_blocks = len(blocks)
+        if max_tokens:
+            blocks = apply_token_budget(blocks, max_tokens)
+
+        text = "\n".join(block["text"] for block in blocks)
+        omitted = total_blocks - len(blocks)
+        if omitted:
+            logger.info(f"Token budget {max_tokens}: omitted {omitted}/{total_blocks} blocks")
 
         logger.debug(f"Extracted text: {text}")
 
@@ -21,9 +124,10 @@ def extract_docx_text(input_path: str) -> Dict:
             "content_type": "text",
             "method": "python-docx",
             "word_count": len(text.split()),
-            "text": text
+            "text": text,
+            "tables": sum(1 for block in blocks if "table" in block),
+            "omitted_blocks": omitted,
         }
     except Exception as e:
         logger.error(f"Failed to extract content from docx: {str(e)}", exc_info=True)
         raise Exception(f"DOCX extraction failed: {str(e)}")
-    
\ No newline at end of file
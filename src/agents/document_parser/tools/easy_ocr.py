@@ -1,24 +1,26 @@
 from typing import Dict, Union
-from easyocr import Reader
 import numpy as np
 from PIL import Image
 from langsmith import traceable
 
-from src.core.settings import settings
+from src.core.model_registry import model_registry
+from src.core.model_client import model_client, encode_image
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
 
-reader = Reader(settings.EASYOCR_LANGUAGES, gpu=False)  # Initialize once, use CPU
-
 @traceable(name="Easy OCR Parser")
 def easyocr_extractor(image: Union[str, Image.Image, np.ndarray]) -> str:
     """Extract text from image file path, PIL image, or numpy array using EasyOCR"""
     logger.info("Starting EasyOCR extraction...")
     try:
+        if model_client.enabled:
+            return model_client.request("ocr", image=encode_image(image))
+
         if isinstance(image, Image.Image):
             # Convert PIL Image to numpy array
             image = np.array(image)
 
+        reader = model_registry.get("easyocr")  # loaded once per process, on first use
         result = reader.readtext(image, detail=0)  # returns list of strings
         text = "\n".join(result)
         return text.strip()
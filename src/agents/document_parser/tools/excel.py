@@ -1,32 +1,151 @@
 from openpyxl import load_workbook
-from typing import Dict
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from src.core.settings import settings
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
 
 from langsmith import traceable
 
+
+def _cell_text(value) -> str:
+    """Compact string for a cell value ("" for empty cells, 12.0 -> "12")"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ", timespec="minutes") if value.time() != datetime.min.time() else value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).strip()
+
+
+def iter_sheet_rows(
+    input_path: str,
+    max_rows: int = None,
+    max_columns: int = None
+) -> Iterator[Tuple[str, List[str], bool]]:
+    """Stream (sheet name, non-empty row cells, truncated) in read-only mode.
+
+    Rows are capped per sheet at `max_rows` non-empty rows and `max_columns`
+    columns; the last row kept from a capped sheet has truncated=True.
+    """
+    max_rows = max_rows or settings.EXCEL_MAX_ROWS_PER_SHEET
+    max_columns = max_columns or settings.EXCEL_MAX_COLUMNS
+
+    # read_only streams rows from the XML instead of building every cell object;
+    # data_only gives cached formula results instead of the formulas
+    wb = load_workbook(input_path, read_only=True, data_only=True)
+    try:
+        for sheet in wb.worksheets:
+            count = 0
+            pending = None  # held back one row so the cap row can be flagged
+            for row in sheet.iter_rows(max_col=max_columns, values_only=True):
+                cells = [_cell_text(cell) for cell in row]
+                while cells and not cells[-1]:
+                    cells.pop()
+                if not cells:
+                    continue
+                count += 1
+                if count > max_rows:
+                    logger.warning(f"Sheet '{sheet.title}' truncated at {max_rows} rows")
+                    yield sheet.title, pending, True
+                    pending = None
+                    break
+                if pending is not None:
+                    yield sheet.title, pending, False
+                pending = cells
+            if pending is not None:
+                yield sheet.title, pending, False
+    finally:
+        wb.close()
+
+
+def _is_header(cells: List[str]) -> bool:
+    """A header row is all labels: no empty or numeric cells"""
+    return len(cells) > 1 and all(cell and not cell.replace(".", "", 1).lstrip("-").isdigit() for cell in cells)
+
+
+def extract_excel_records(input_path: str, max_rows: int = None, max_columns: int = None) -> List[Dict]:
+    """Header-aware records per sheet: [{"sheet", "header", "records": [{column: value}], "truncated"}]"""
+    sheets: List[Dict] = []
+    current: Optional[Dict] = None
+    for name, cells, truncated in iter_sheet_rows(input_path, max_rows, max_columns):
+        if current is None or current["sheet"] != name:
+            current = {"sheet": name, "header": None, "records": [], "truncated": False}
+            sheets.append(current)
+            if _is_header(cells):
+                current["header"] = cells
+                continue
+        header = current["header"] or [f"column_{index + 1}" for index in range(len(cells))]
+        record = {
+            (header[index] if index < len(header) else f"column_{index + 1}"): cell
+            for index, cell in enumerate(cells) if cell
+        }
+        current["records"].append(record)
+        current["truncated"] = truncated
+    return sheets
+
+
 @traceable(name="Excel Parser")
-def extract_excel_text(input_path: str) -> Dict:
-    """Extract text from Excel files"""
+def extract_excel_text(input_path: str, output_format: str = None) -> Dict:
+    """Extract text from Excel files.
+
+    output_format (default EXCEL_OUTPUT_FORMAT):
+    - "table": per sheet a "[Sheet <name>]" line, then one " | "-separated line per row
+    - "records": header-aware "column: value; ..." lines, plus the records themselves
+    - "text": the plain space-separated cell dump
+    """
     logger.info(f"Extracting excel file...")
+    output_format = output_format or settings.EXCEL_OUTPUT_FORMAT
     try:
-        wb = load_workbook(input_path)
-        text = ""
-        
-        for sheet in wb:
-            for row in sheet.iter_rows(values_only=True):
-                text += " ".join(str(cell) for cell in row if cell) + "\n"
-        
-        logger.debug(f"Extracted text: {text}")
-        
-        # with open(output_path, 'w', encoding='utf-8') as f:
-        #     f.write(text)
-            
+        if output_format == "records":
+            sheet_records = extract_excel_records(input_path)
+            lines = [
+                f"[{sheet['sheet']}] " + "; ".join(f"{column}: {value}" for column, value in record.items())
+                for sheet in sheet_records
+                for record in sheet["records"]
+            ]
+            text = "\n".join(lines)
+            return {
+                "method": "openpyxl",
+                "word_count": len(text.split()),
+                "text": text,
+                "sheets": [
+                    {"sheet": sheet["sheet"], "rows": len(sheet["records"]), "truncated": sheet["truncated"]}
+                    for sheet in sheet_records
+                ],
+                "records": sheet_records,
+            }
+
+        # Lines are collected and joined once (no repeated string concatenation)
+        lines: List[str] = []
+        sheets: List[Dict] = []
+        for name, cells, truncated in iter_sheet_rows(input_path):
+            if not sheets or sheets[-1]["sheet"] != name:
+                sheets.append({"sheet": name, "rows": 0, "truncated": False})
+                if output_format == "table":
+                    if lines:
+                        lines.append("")
+                    lines.append(f"[Sheet {name}]")
+            sheets[-1]["rows"] += 1
+            sheets[-1]["truncated"] = truncated
+
+            if output_format == "table":
+                lines.append(" | ".join(cells))
+            else:
+                lines.append(" ".join(cell for cell in cells if cell))
+
+        text = "\n".join(lines)
+        logger.debug(f"Extracted {len(text)} chars from {len(sheets)} sheets")
+
         return {
             "method": "openpyxl",
             "word_count": len(text.split()),
-            "text": text
+            "text": text,
+            "sheets": sheets,
         }
     except Exception as e:
-        raise Exception(f"Excel extraction failed: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Excel extraction failed: {str(e)}")
@@ -1,7 +1,9 @@
-from pdfminer.high_level import extract_text
+from PyPDF2 import PdfReader
 from pdf2image import convert_from_path
-from typing import Dict
-import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+import multiprocessing
+import threading
 import time
 
 from langsmith import traceable
@@ -10,34 +12,118 @@ from langsmith import traceable
 # from app.config.tesseract_config import pytesseract
 from src.agents.document_parser.tools.easy_ocr import easyocr_extractor
 
+from src.core.settings import settings
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
 
+# Process pool for page OCR, created on first scanned page
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+
+def get_ocr_pool() -> ProcessPoolExecutor:
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            # spawn, not fork: forking the threaded server process (uvicorn, torch,
+            # httpx) can copy held locks into the workers and deadlock them
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_OCR_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _ocr_pool
+
+
+def extract_text_layer(input_path: str) -> List[Dict]:
+    """Fast per-page text-layer pass (PyPDF2, pdfminer as fallback)"""
+    pages = []
+    try:
+        reader = PdfReader(input_path)
+        for number, page in enumerate(reader.pages, start=1):
+            start_time = time.perf_counter()
+            text = page.extract_text() or ""
+            pages.append({"page": number, "text": text, "seconds": round(time.perf_counter() - start_time, 3)})
+        return pages
+
+    except Exception as e:
+        logger.warning(f"PyPDF2 could not read the text layer ({e}), falling back to pdfminer")
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+
+        pages = []
+        start_time = time.perf_counter()
+        for number, layout in enumerate(extract_pages(input_path), start=1):
+            text = "".join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+            pages.append({"page": number, "text": text, "seconds": round(time.perf_counter() - start_time, 3)})
+            start_time = time.perf_counter()
+        return pages
+
+
+def ocr_page(input_path: str, page_number: int, dpi: int) -> Dict:
+    """Render a single page and OCR it (runs in a pool worker, one page in memory at a time)"""
+    start_time = time.perf_counter()
+    images = convert_from_path(input_path, dpi=dpi, first_page=page_number, last_page=page_number)
+    render_time = time.perf_counter() - start_time
+
+    text = easyocr_extractor(images[0]) if images else ""
+    return {
+        "page": page_number,
+        "text": text,
+        "render_seconds": round(render_time, 3),
+        "ocr_seconds": round(time.perf_counter() - start_time - render_time, 3),
+    }
+
+
+def ocr_pdf_pages(input_path: str, page_numbers: List[int], dpi: int) -> List[Dict]:
+    """OCR the given pages on the process pool, results in page order"""
+    pool = get_ocr_pool()
+    futures = [pool.submit(ocr_page, input_path, page, dpi) for page in page_numbers]
+    pages = [future.result() for future in futures]
+    for page in pages:
+        logger.debug(f"Page {page['page']}: render {page['render_seconds']}s, OCR {page['ocr_seconds']}s")
+    return pages
+
 
 @traceable(name="PDF Parser")
 def extract_pdf_text(input_path: str) -> Dict:
-    """Extract text from PDF, with OCR fallback"""
+    """Extract text per page from the text layer, OCR only pages with too little text"""
     logger.info(f"Extracting pdf file...")
     try:
-        # First try regular extraction
-        text = extract_text(input_path)
-        
-        # If little text found, try OCR
-        if len(text.strip()) < 100:
-            images = convert_from_path(input_path)
-            text = ""
-            logger.info("Extracting with EasyOCR...")
+        pages = extract_text_layer(input_path)
+        for page in pages:
+            page["method"] = "text"
+
+        # Pages with (almost) no text layer are scanned: OCR them
+        low_text = [page["page"] for page in pages if len(page["text"].strip()) < settings.PDF_MIN_PAGE_CHARS]
+        skipped = low_text[settings.PDF_OCR_MAX_PAGES:]
+        if skipped:
+            logger.warning(
+                f"{len(low_text)} pages need OCR, limited to first {settings.PDF_OCR_MAX_PAGES}; "
+                f"skipping pages {skipped[0]}-{skipped[-1]}"
+            )
+            low_text = low_text[:settings.PDF_OCR_MAX_PAGES]
+            # Not OCRed: flag them so they are not mistaken for blank text pages
+            for number in skipped:
+                pages[number - 1]["method"] = "skipped"
+
+        if low_text:
+            logger.info(f"Extracting {len(low_text)}/{len(pages)} pages with EasyOCR...")
             start_time = time.perf_counter()
-            
-            for image in images:
-                text += easyocr_extractor(image) + "\n"
-            method = "pdfminer+ocr"
+
+            for result in ocr_pdf_pages(input_path, low_text, dpi=settings.PDF_OCR_DPI):
+                page = pages[result["page"] - 1]
+                page["text"] = result["text"]
+                page["method"] = "ocr"
+                page["seconds"] = round(page["seconds"] + result["render_seconds"] + result["ocr_seconds"], 3)
 
             total_time = time.perf_counter() - start_time
             logger.info(f"OCR processing time: {total_time:.2f} seconds")
+            method = "pypdf2+ocr"
         else:
-            method = "pdfminer"
+            method = "pypdf2"
 
+        # Form feed between pages: the analyzer chunks documents on page boundaries
+        text = "\f".join(page["text"] for page in pages)
         logger.debug(f"Extracted text: {text}")
         
         # # Save extracted text
@@ -47,7 +133,17 @@ def extract_pdf_text(input_path: str) -> Dict:
         return {
             "method": method,
             "word_count": len(text.split()),
-            "text": text
+            "text": text,
+            "skipped_pages": len(skipped),
+            "pages": [
+                {
+                    "page": page["page"],
+                    "method": page["method"],
+                    "chars": len(page["text"]),
+                    "seconds": page["seconds"],
+                }
+                for page in pages
+            ],
         }
     except Exception as e:
-        raise Exception(f"PDF extraction failed: {str(e)}")
\ No newline at end of file
+        raise Exception(f"PDF extraction failed: {str(e)}")
@@ -11,6 +11,7 @@ from src.agents.whatsapp.edges import (
     analyzer_router
 )
 from src.agents.whatsapp.state import ChatState
+from src.core.metrics import timed_node
 
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
@@ -20,11 +21,11 @@ async def build_graph(checkpointer) -> StateGraph:
     graph_builder = StateGraph(ChatState)
 
     # Add all nodes
-    graph_builder.add_node("AnalyzerNode", analyzer_node)
-    graph_builder.add_node("AssistantNode", assistant_node)
-    graph_builder.add_node("VoiceTranscriptionNode", voice_transcription_node)
+    graph_builder.add_node("AnalyzerNode", timed_node("whatsapp", "AnalyzerNode", analyzer_node))
+    graph_builder.add_node("AssistantNode", timed_node("whatsapp", "AssistantNode", assistant_node))
+    graph_builder.add_node("VoiceTranscriptionNode", timed_node("whatsapp", "VoiceTranscriptionNode", voice_transcription_node))
     # Add sub graph
-    graph_builder.add_node("DocParserSubGraph", doc_parser_subgraph_node)
+    graph_builder.add_node("DocParserSubGraph", timed_node("whatsapp", "DocParserSubGraph", doc_parser_subgraph_node))
 
     # Define workflow
     graph_builder.add_conditional_edges(
@@ -1,8 +1,6 @@
 import os
 import json
-from groq import Groq
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from langgraph.prebuilt import create_react_agent
 from langchain_core.prompts import ChatPromptTemplate
 
 from src.core.settings import settings
@@ -15,15 +13,18 @@ from src.agents.whatsapp.prompts import (
     USER_FILE_PROMPT_WITHOUT_MESSAGE
 )
 from src.agents.whatsapp.tools import (
-    make_vector_search,
+    vector_search,
     client_db_query,
     get_schema_details
 )
 from src.utils.helpers import (
-    get_chat_model
+    get_chat_model,
+    get_react_agent
 )
 
 from src.agents.whatsapp.state import ChatState
+from src.utils.job_queue import job_queue
+from src.core.transcription import transcriber
 
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
@@ -45,7 +46,7 @@ async def analyzer_node(state: ChatState) -> ChatState:
 
     try:
         # call LLM
-        response = await model.ainvoke(messages)
+        response = await job_queue.run("llm", lambda: model.ainvoke(messages))
     except Exception as e:
         raise RuntimeError(f"Error in analyzer_node LLM call: {e}")
 
@@ -71,11 +72,8 @@ async def analyzer_node(state: ChatState) -> ChatState:
 
 async def assistant_node(state: ChatState) -> ChatState:
 
-    model = get_chat_model()
-    # Define tools
-    tools = [make_vector_search(state), client_db_query, get_schema_details]
-    # Create ReAct agent
-    react_agent = create_react_agent(model, tools=tools)
+    # Shared ReAct agent; vector_search reads the user from the graph config
+    react_agent = get_react_agent([vector_search, client_db_query, get_schema_details])
 
     if state.get('is_doc'):
         logger.info("Document in the query")
@@ -107,9 +105,9 @@ async def assistant_node(state: ChatState) -> ChatState:
             HumanMessage(content=state.get("query"))
         ]
 
-    response = await react_agent.ainvoke({
-        "messages": messages
-    })
+    # No config override: the agent inherits the graph's configurable (user_id for
+    # vector_search, and the checkpoint namespace the /chat/stream/ filter relies on)
+    response = await job_queue.run("llm", lambda: react_agent.ainvoke({"messages": messages}))
     
     logger.debug(f"Assistant Node Response: {response}")
 
@@ -140,21 +138,14 @@ async def voice_transcription_node(state: ChatState) -> ChatState:
         logger.error(f"Unsupported audio format: {file_ext}")
         return state
 
-    # Initialize Groq client
-    client = Groq()
     try:
-        with open(file_path, "rb") as file:
-            # Transcribe audio file
-            transcription = client.audio.transcriptions.create(
-                file=(file_path, file.read()),
-                model=settings.AUDIO_MODEL,
-                response_format="verbose_json",
-            )
+        # Shared async client (pooled, retried); the "transcription" pool bounds concurrent notes
+        text = await job_queue.run("transcription", lambda: transcriber.transcribe_file(file_path))
 
-        logger.debug(f"Transcription result: {transcription.text}")
+        logger.debug(f"Transcription result: {text}")
 
-        state["voice_msg_transcription"] = transcription.text
-        state["query"] = transcription.text
+        state["voice_msg_transcription"] = text
+        state["query"] = text
 
         return state
     
@@ -175,6 +166,7 @@ async def doc_parser_subgraph_node(state: ChatState) -> ChatState:
 
     subgraph_state = {
         "file_path": state.get("file"),
+        "file_hash": state.get("file_hash", ""),  # hashed during download, lets the parser skip known files
     }
 
     subgraph_response = await subgraph.ainvoke(subgraph_state)
@@ -10,6 +10,7 @@ class ChatState(TypedDict):
     user_name: str
     query: str
     file: str
+    file_hash: str
     file_extension: str
     is_voice_msg: bool = False
     voice_msg_transcription: str
@@ -1,8 +1,8 @@
 from typing import List, Dict, Any
 from langchain_core.tools import tool
+from langchain_core.runnables import RunnableConfig
 
 from src.core.settings import settings
-from src.agents.whatsapp.state import ChatState
 # Assuming you already have qdrant_manager and client_db available
 from src.utils.qdrant_db import qdrant_manager
 from src.utils.ms_sql_manager import client_db
@@ -14,21 +14,23 @@ from src.core.db_query import (
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
 
-def make_vector_search(state: ChatState):
-    @tool
-    async def _vector_search(query: str) -> List[str]:
-        """
-        Search the Qdrant vector database for relevant past conversations of this user.
-        Args:
-            query: The user query
-        Returns:
-            List of relevant documents
-        """
-        results = await qdrant_manager.search_messages(query, state["user_id"])
-        if not results:
-            return ["No results found"]
-        return [r["content"] for r in results]
-    return _vector_search
+@tool
+async def vector_search(query: str, config: RunnableConfig) -> List[str]:
+    """
+    Search the Qdrant vector database for relevant past conversations of this user.
+    Args:
+        query: The user query
+    Returns:
+        List of relevant documents
+    """
+    # user_id comes from the run config so one tool (and agent) serves every user
+    user_id = config.get("configurable", {}).get("user_id")
+    if not user_id:
+        return ["No results found"]
+    results = await qdrant_manager.search_messages(query, user_id)
+    if not results:
+        return ["No results found"]
+    return [r["content"] for r in results]
 
 # get schema details
 async def _get_schema_details():
@@ -0,0 +1,137 @@
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Any
+from uuid import uuid4
+
+from qdrant_client.http.models import PointStruct, Filter, FieldCondition, MatchValue, MatchAny, Range
+
+from src.agents.whatsapp_rag.settings import settings
+from src.agents.whatsapp_rag.qdrant_client import qdrant_manager
+from src.core.logging_config import get_logger
+logger = get_logger(__name__)
+
+# Document point ids returned by vector_search during the current request
+retrieved_source_ids: ContextVar[Optional[List[str]]] = ContextVar("retrieved_source_ids", default=None)
+
+_ARABIC_CHARS = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF]")
+_LETTERS = re.compile(r"[^\W\d_]")
+
+
+def detect_language(text: str) -> str:
+    """Coarse script-based language bucket, answers are only reused within the same bucket"""
+    letters = _LETTERS.findall(text)
+    if not letters:
+        return "other"
+    arabic = sum(1 for char in letters if _ARABIC_CHARS.match(char))
+    return "arabic" if arabic / len(letters) >= 0.5 else "latin"
+
+
+class SemanticAnswerCache:
+    """
+    Cache of assistant answers keyed by query embedding.
+    - Stored in a dedicated Qdrant collection: vector = query embedding,
+      payload = user_id, query, language, answer, source_ids, created_at.
+    - A lookup hits when an entry of the same user and language is within
+      `threshold` cosine similarity; answers are personalized ("Hello {user_name}")
+      so they are never replayed to another user.
+    - Entries are invalidated by source document ids when documents are re-ingested.
+    """
+
+    def __init__(self, **kwargs):
+        self.collection_name = kwargs.get('collection_name', settings.ANSWER_CACHE_COLLECTION)
+        self.threshold = kwargs.get('threshold', settings.ANSWER_CACHE_THRESHOLD)
+        self.ttl = kwargs.get('ttl_seconds', settings.ANSWER_CACHE_TTL_SECONDS)
+        self.enabled = kwargs.get('enabled', settings.ANSWER_CACHE_ENABLED)
+
+        # metrics
+        self.lookups = 0
+        self.hits = 0
+        self._miss_latency_total = 0.0
+        self._miss_count = 0
+        self._latency_saved = 0.0
+
+    async def lookup(self, embedding: List[float], language: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Return cached payload for a similar query of this user, or None"""
+        if not self.enabled or not user_id:
+            return None
+
+        self.lookups += 1
+        try:
+            hits = await qdrant_manager.search_points(
+                embedding,
+                collection_name=self.collection_name,
+                limit=1,
+                score_threshold=self.threshold,
+                query_filter=Filter(must=[
+                    FieldCondition(key="user_id", match=MatchValue(value=user_id)),
+                    FieldCondition(key="language", match=MatchValue(value=language)),
+                    FieldCondition(key="created_at", range=Range(gte=time.time() - self.ttl)),
+                ]),
+            )
+        except Exception as e:
+            logger.error(f"Answer cache lookup failed: {e}")
+            return None
+
+        if not hits:
+            return None
+        self.hits += 1
+        logger.info(f"Answer cache hit (score={hits[0].score:.3f})")
+        return hits[0].payload
+
+    async def store(self, embedding: List[float], query: str, language: str, answer: str, source_ids: List[str], user_id: str):
+        """Cache an answer for this user; answers not grounded in retrieved documents are skipped"""
+        if not self.enabled or not answer or not source_ids or not user_id:
+            return
+        try:
+            await qdrant_manager.upsert_points(
+                [PointStruct(
+                    id=str(uuid4()),
+                    vector=embedding,
+                    payload={
+                        "user_id": user_id,
+                        "query": query,
+                        "language": language,
+                        "answer": answer,
+                        "source_ids": sorted(set(source_ids)),
+                        "created_at": time.time(),
+                    }
+                )],
+                collection_name=self.collection_name,
+                wait=False,  # on the request path; a lookup racing the indexing just misses
+            )
+        except Exception as e:
+            logger.error(f"Answer cache store failed: {e}")
+
+    async def invalidate(self, source_ids: Optional[List[str]] = None):
+        """Drop entries built on any of `source_ids` (all entries when None)"""
+        query_filter = None
+        if source_ids is not None:
+            if not source_ids:
+                return
+            query_filter = Filter(must=[FieldCondition(key="source_ids", match=MatchAny(any=list(source_ids)))])
+        await qdrant_manager.delete_points(collection_name=self.collection_name, query_filter=query_filter)
+        logger.info(f"Answer cache invalidated for {len(source_ids) if source_ids is not None else 'all'} sources")
+
+    def record_miss_latency(self, seconds: float):
+        self._miss_latency_total += seconds
+        self._miss_count += 1
+
+    def record_hit_latency(self, seconds: float):
+        if self._miss_count:
+            self._latency_saved += max(0.0, self._miss_latency_total / self._miss_count - seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio and estimated latency saved (vs. average uncached answer)"""
+        return {
+            "enabled": self.enabled,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_ratio": self.hits / self.lookups if self.lookups else 0.0,
+            "avg_miss_latency_s": self._miss_latency_total / self._miss_count if self._miss_count else 0.0,
+            "latency_saved_s": round(self._latency_saved, 3),
+        }
+
+
+# Singleton cache
+answer_cache = SemanticAnswerCache()
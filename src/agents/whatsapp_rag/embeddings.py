@@ -1,28 +1,76 @@
 import asyncio
-from sentence_transformers import SentenceTransformer
 
-model = SentenceTransformer("intfloat/multilingual-e5-large")
+from src.core.embedding_batcher import EmbeddingBatcher
+from src.core.embedding_cache import AsyncEmbeddingCache
+from src.core.model_registry import model_registry
+from src.core.model_client import model_client
+from src.core.metrics import timed
+from src.agents.whatsapp_rag.settings import settings
 
+MODEL_NAME = "intfloat/multilingual-e5-large"
+
+
+def _encode_texts(texts: list) -> list:
+    if model_client.enabled:
+        return model_client.request("embed", model="e5-large", inputs=texts)
+    # multilingual-e5-large is loaded on first use
+    model = model_registry.get("e5-large")
+    return model.encode(
+        texts,
+        batch_size=len(texts),
+        normalize_embeddings=True,
+        convert_to_numpy=True
+    ).tolist()
+
+# Concurrent queries/passages are coalesced into one forward pass
+batcher = EmbeddingBatcher(_encode_texts, max_batch_size=32, max_wait_ms=5.0, name="e5-large")
+
+# Repeated/near-identical search queries skip the encoder
+query_cache = AsyncEmbeddingCache(
+    max_size=settings.QUERY_CACHE_SIZE,
+    ttl_seconds=settings.QUERY_CACHE_TTL_SECONDS,
+    disk_path=settings.QUERY_CACHE_DISK_PATH,
+)
+
+
+def format_text(text: str, is_query: bool = False) -> str:
+    """Add the appropriate prefix for E5 models"""
+    prefix = "query: " if is_query else "passage: "
+    return prefix + text.strip()
+
+
+@timed("embed_text.e5")
 async def embed_text(text: str, is_query: bool = False):
     """
     Asynchronously generate normalized embeddings using multilingual-e5-large.
     - Automatically adds 'query:' or 'passage:' prefix.
     - Supports both Arabic and English input.
     """
-    loop = asyncio.get_event_loop()
-    
-    # Add the appropriate prefix for E5 models
+    return await batcher.embed(format_text(text, is_query))
+
+
+@timed("embed_texts.e5")
+async def embed_texts(texts: list, is_query: bool = False):
+    """Batch variant of embed_text, one vector per input text"""
+    return await batcher.embed_many([format_text(text, is_query) for text in texts])
+
+
+async def embed_passages_bulk(texts: list, batch_size: int = 128):
+    """Ingestion path: large direct encode calls that bypass the request batcher"""
+    vectors = []
+    for i in range(0, len(texts), batch_size):
+        batch = [format_text(text) for text in texts[i:i + batch_size]]
+        vectors.extend(await asyncio.to_thread(_encode_texts, batch))
+    return vectors
+
+
+@timed("embed_text_cached.e5")
+async def embed_text_cached(text: str, is_query: bool = False):
+    """embed_text behind the LRU/TTL query cache"""
     prefix = "query: " if is_query else "passage: "
-    formatted_text = prefix + text.strip()
-    
-    # Encode asynchronously to avoid blocking event loop
-    embedding = await loop.run_in_executor(
-        None,
-        lambda: model.encode(
-            formatted_text,
-            normalize_embeddings=True,
-            convert_to_numpy=True
-        )
+    return await query_cache.get_or_embed(
+        text,
+        model=MODEL_NAME,
+        prefix=prefix,
+        embed_fn=lambda: embed_text(text, is_query),
     )
-    
-    return embedding.tolist()
@@ -9,6 +9,7 @@ from src.agents.whatsapp.nodes import (
 from src.agents.whatsapp_rag.nodes import rag_assistant_node
 from src.core.settings import settings
 from src.agents.whatsapp.state import ChatState
+from src.core.metrics import timed_node
 
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
@@ -30,8 +31,8 @@ def file_router(state: ChatState):
 async def build_graph(checkpointer) -> StateGraph:
 
     graph_builder = StateGraph(ChatState)
-    graph_builder.add_node("VoiceTranscriptionNode", voice_transcription_node)
-    graph_builder.add_node("RAGAssistantNode", rag_assistant_node)
+    graph_builder.add_node("VoiceTranscriptionNode", timed_node("whatsapp_rag", "VoiceTranscriptionNode", voice_transcription_node))
+    graph_builder.add_node("RAGAssistantNode", timed_node("whatsapp_rag", "RAGAssistantNode", rag_assistant_node))
 
     # Define workflow
     graph_builder.add_conditional_edges(
@@ -0,0 +1,306 @@
+"""
+Bulk document ingestion into the RAG collection.
+
+Usage:
+    python -m src.agents.whatsapp_rag.ingest [--data-dir data/docs] [--workers 4]
+
+Files under DATA_DIR are parsed with the document_parser extractors on a
+process pool, split into overlapping chunks, embedded with e5 in large
+batches and upserted in chunked bulk writes. Point ids are derived from
+(relative path, chunk index) so re-running the ingestion is idempotent.
+
+Runs are incremental: a local manifest of file and chunk hashes lets the
+pipeline skip unchanged files, re-embed only changed chunks and delete
+points of removed chunks/files. Use --dry-run to print the planned delta
+and --full to ignore the manifest.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any
+from uuid import uuid5, NAMESPACE_URL
+
+from qdrant_client.http.models import PointStruct
+
+from src.agents.whatsapp_rag.settings import settings
+from src.agents.whatsapp_rag.qdrant_client import qdrant_manager
+from src.agents.whatsapp_rag.embeddings import embed_passages_bulk
+from src.agents.whatsapp_rag.answer_cache import answer_cache
+from src.agents.whatsapp_rag.manifest import IngestManifest, text_hash
+from src.agents.document_parser.cache import file_sha256
+
+from src.core.logging_config import get_logger
+logger = get_logger(__name__)
+
+SUPPORTED_EXTENSIONS = {".pdf", ".doc", ".docx", ".xls", ".xlsx", ".jpg", ".jpeg", ".png", ".tiff"}
+
+
+def discover_files(data_dir: Path) -> List[Path]:
+    """All supported documents under data_dir, in a stable order"""
+    return sorted(
+        path for path in Path(data_dir).rglob("*")
+        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS
+    )
+
+
+def chunk_passages(text: str, chunk_size: int, overlap: int) -> List[str]:
+    """Split text into ~chunk_size character chunks, preferring paragraph/line/word boundaries"""
+    text = text.strip()
+    if not text:
+        return []
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            # back off to the nearest boundary in the second half of the window
+            for separator in ("\n\n", "\n", ". ", " "):
+                boundary = text.rfind(separator, start + chunk_size // 2, end)
+                if boundary != -1:
+                    end = boundary + len(separator)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+def point_id(source: str, chunk_index: int) -> str:
+    """Deterministic point id for a document chunk"""
+    return str(uuid5(NAMESPACE_URL, f"{source}:{chunk_index}"))
+
+
+def parse_file(file_path: str) -> Dict[str, Any]:
+    """Runs in a worker process: extract text with the matching document_parser extractor"""
+    from src.agents.document_parser.nodes import get_extractor
+
+    extractor = get_extractor(file_path)
+    if extractor is None:
+        return {"file_path": file_path, "error": "no extractor"}
+    try:
+        result = extractor(input_path=file_path)
+        return {"file_path": file_path, "text": result.get("text") or "", "method": result.get("method")}
+    except Exception as e:
+        return {"file_path": file_path, "error": str(e)}
+
+
+class IngestionPipeline:
+    """Parse (process pool) -> chunk -> embed (large batches) -> bulk upsert"""
+
+    def __init__(self, **kwargs):
+        self.data_dir = Path(kwargs.get('data_dir', settings.DATA_DIR))
+        self.workers = kwargs.get('workers', settings.INGEST_WORKERS)
+        self.chunk_size = kwargs.get('chunk_size', settings.INGEST_CHUNK_SIZE)
+        self.chunk_overlap = kwargs.get('chunk_overlap', settings.INGEST_CHUNK_OVERLAP)
+        self.embed_batch_size = kwargs.get('embed_batch_size', settings.INGEST_EMBED_BATCH_SIZE)
+        self.collection_name = kwargs.get('collection_name', settings.COLLECTION_NAME)
+        self.manifest_path = Path(kwargs.get('manifest_path', settings.INGEST_MANIFEST_PATH))
+
+    def source_name(self, file_path: Path) -> str:
+        return Path(file_path).resolve().relative_to(self.data_dir.resolve()).as_posix()
+
+    def build_chunks(self, parsed: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Chunk records (id + payload) for one parsed document"""
+        source = self.source_name(parsed["file_path"])
+        return [
+            {
+                "id": point_id(source, index),
+                "hash": text_hash(chunk),
+                "payload": {
+                    "text": chunk,
+                    "source": source,
+                    "chunk_index": index,
+                    "extraction_method": parsed.get("method"),
+                },
+            }
+            for index, chunk in enumerate(chunk_passages(parsed["text"], self.chunk_size, self.chunk_overlap))
+        ]
+
+    async def write_chunks(self, chunks: List[Dict[str, Any]]):
+        """Embed and upsert chunk records, invalidating cached answers built on them"""
+        vectors = await embed_passages_bulk(
+            [chunk["payload"]["text"] for chunk in chunks],
+            batch_size=self.embed_batch_size,
+        )
+        points = [
+            PointStruct(id=chunk["id"], vector=vector, payload=chunk["payload"])
+            for chunk, vector in zip(chunks, vectors)
+        ]
+        # wait (default): documents must be searchable once ingest reports them done
+        await qdrant_manager.upsert_points(points, collection_name=self.collection_name)
+        await answer_cache.invalidate(source_ids=[chunk["id"] for chunk in chunks])
+
+    async def parse_files(self, files: List[Path]):
+        """Yield parse results as worker processes finish them"""
+        loop = asyncio.get_running_loop()
+        # spawn: forking a process with live threads (torch, httpx) can deadlock the workers
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            tasks = [loop.run_in_executor(pool, parse_file, str(path)) for path in files]
+            for task in asyncio.as_completed(tasks):
+                yield await task
+
+    async def delete_points(self, point_ids: List[str]):
+        """Remove orphaned chunks and the cached answers built on them"""
+        if not point_ids:
+            return
+        await qdrant_manager.delete_points(collection_name=self.collection_name, point_ids=point_ids)
+        await answer_cache.invalidate(source_ids=point_ids)
+
+    async def run(self, dry_run: bool = False, full: bool = False) -> Dict[str, Any]:
+        """
+        Ingest the delta between DATA_DIR and the manifest.
+        - dry_run: compute and log the delta without writing anything.
+        - full: re-ingest every file and chunk (orphans are still cleaned up).
+        """
+        start_time = time.perf_counter()
+        manifest = IngestManifest.load(self.manifest_path)
+
+        files = discover_files(self.data_dir)
+        hashes = await asyncio.to_thread(lambda: {self.source_name(path): file_sha256(path) for path in files})
+        sources = {self.source_name(path): path for path in files}
+
+        changed = [path for source, path in sources.items() if full or manifest.file_hash(source) != hashes[source]]
+        removed = [source for source in manifest.entries if source not in sources]
+        logger.info(
+            f"Ingestion plan for {self.data_dir}: {len(changed)} new/changed, "
+            f"{len(files) - len(changed)} unchanged, {len(removed)} removed"
+        )
+
+        plan: List[Dict[str, Any]] = []
+        deleted = 0
+
+        # Files removed from disk: drop all their points
+        for source in removed:
+            orphan_ids = list(manifest.chunks(source))
+            plan.append({"source": source, "action": "removed", "embed": 0, "delete": len(orphan_ids)})
+            deleted += len(orphan_ids)
+            if not dry_run:
+                await self.delete_points(orphan_ids)
+                manifest.remove(source)
+
+        documents, failed, total_chunks = 0, 0, 0
+        pending: List[Dict[str, Any]] = []
+        remaining: Dict[str, int] = {}  # source -> chunks not yet written
+        finished: Dict[str, Dict[str, str]] = {}  # source -> new chunk hashes
+
+        async def _flush(batch: List[Dict[str, Any]]):
+            await self.write_chunks(batch)
+            for chunk in batch:
+                source = chunk["payload"]["source"]
+                remaining[source] -= 1
+                if remaining[source] == 0:
+                    manifest.set(source, hashes[source], finished.pop(source))
+            manifest.save()
+
+        async for parsed in self.parse_files(changed):
+            if "error" in parsed:
+                failed += 1
+                logger.error(f"Failed to parse {parsed['file_path']}: {parsed['error']}")
+                continue
+
+            documents += 1
+            source = self.source_name(parsed["file_path"])
+            chunks = self.build_chunks(parsed)
+            old_chunks = manifest.chunks(source)
+
+            to_write = [chunk for chunk in chunks if full or old_chunks.get(chunk["id"]) != chunk["hash"]]
+            orphan_ids = sorted(set(old_chunks) - {chunk["id"] for chunk in chunks})
+            plan.append({
+                "source": source,
+                "action": "changed" if source in manifest.entries else "new",
+                "embed": len(to_write),
+                "delete": len(orphan_ids),
+            })
+            total_chunks += len(to_write)
+            deleted += len(orphan_ids)
+            if dry_run:
+                continue
+
+            await self.delete_points(orphan_ids)
+            new_hashes = {chunk["id"]: chunk["hash"] for chunk in chunks}
+            if not to_write:
+                manifest.set(source, hashes[source], new_hashes)
+                continue
+            remaining[source] = len(to_write)
+            finished[source] = new_hashes
+
+            pending.extend(to_write)
+            while len(pending) >= self.embed_batch_size:
+                batch, pending = pending[:self.embed_batch_size], pending[self.embed_batch_size:]
+                await _flush(batch)
+
+        if not dry_run:
+            if pending:
+                await _flush(pending)
+            manifest.save()
+
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            "dry_run": dry_run,
+            "files": len(files),
+            "unchanged": len(files) - len(changed),
+            "documents": documents,
+            "removed": len(removed),
+            "failed": failed,
+            "chunks": total_chunks,
+            "deleted": deleted,
+            "seconds": round(elapsed, 3),
+            "documents_per_sec": round(documents / elapsed, 2) if elapsed else 0.0,
+            "chunks_per_sec": round(total_chunks / elapsed, 2) if elapsed else 0.0,
+            "plan": plan,
+        }
+        logger.info(f"Ingestion finished: {len(plan)} files in plan, {total_chunks} chunks, {deleted} deletions, {elapsed:.2f} seconds")
+        return stats
+
+
+async def main(args):
+    await qdrant_manager.connect()
+    try:
+        pipeline = IngestionPipeline(
+            data_dir=args.data_dir,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap,
+            embed_batch_size=args.batch_size,
+        )
+        stats = await pipeline.run(dry_run=args.dry_run, full=args.full)
+
+        if args.dry_run:
+            for entry in stats["plan"]:
+                print(f"{entry['action']:<8} {entry['source']}: embed {entry['embed']} chunks, delete {entry['delete']}")
+            print(
+                f"Planned: {stats['chunks']} chunks to embed, {stats['deleted']} points to delete, "
+                f"{stats['unchanged']} unchanged files skipped"
+            )
+            return
+
+        print(
+            f"{stats['documents']}/{stats['files']} documents, {stats['chunks']} chunks in {stats['seconds']}s "
+            f"({stats['documents_per_sec']} docs/s, {stats['chunks_per_sec']} chunks/s, {stats['failed']} failed), "
+            f"{stats['deleted']} points deleted, {stats['unchanged']} unchanged files skipped"
+        )
+    finally:
+        await qdrant_manager.close()
+
+
+if __name__ == "__main__":
+    if sys.platform.startswith("win"):
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=settings.DATA_DIR)
+    parser.add_argument("--workers", type=int, default=settings.INGEST_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=settings.INGEST_CHUNK_SIZE)
+    parser.add_argument("--chunk-overlap", type=int, default=settings.INGEST_CHUNK_OVERLAP)
+    parser.add_argument("--batch-size", type=int, default=settings.INGEST_EMBED_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="print the planned delta without writing")
+    parser.add_argument("--full", action="store_true", help="re-embed every file, even if unchanged")
+    asyncio.run(main(parser.parse_args()))
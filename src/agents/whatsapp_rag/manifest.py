@@ -0,0 +1,50 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class IngestManifest:
+    """
+    Local record of what is already ingested into the RAG collection.
+    {source: {"file_hash": str, "chunks": {point_id: chunk_hash}}}
+    """
+
+    def __init__(self, path: Path, entries: Optional[Dict[str, Any]] = None):
+        self.path = Path(path)
+        self.entries: Dict[str, Any] = entries or {}
+
+    @classmethod
+    def load(cls, path: Path) -> "IngestManifest":
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(path, json.load(f))
+
+    def save(self):
+        """Write atomically so a crash never leaves a truncated manifest"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def file_hash(self, source: str) -> Optional[str]:
+        entry = self.entries.get(source)
+        return entry["file_hash"] if entry else None
+
+    def chunks(self, source: str) -> Dict[str, str]:
+        entry = self.entries.get(source)
+        return dict(entry["chunks"]) if entry else {}
+
+    def set(self, source: str, file_hash: str, chunks: Dict[str, str]):
+        self.entries[source] = {"file_hash": file_hash, "chunks": chunks}
+
+    def remove(self, source: str):
+        self.entries.pop(source, None)
@@ -1,14 +1,21 @@
 import os
 import json
+import time
 import asyncio
 
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from langgraph.prebuilt import create_react_agent
 
 from src.core.settings import settings
 from src.agents.whatsapp_rag.state import State
 from src.agents.whatsapp_rag.tools import vector_search
-from src.utils.helpers import get_chat_model
+from src.agents.whatsapp_rag.embeddings import embed_text_cached
+from src.agents.whatsapp_rag.answer_cache import (
+    answer_cache,
+    detect_language,
+    retrieved_source_ids
+)
+from src.utils.helpers import get_react_agent
+from src.utils.job_queue import job_queue
 from src.agents.whatsapp_rag.prompts import SYSTEM_PROMPT
 
 from src.core.logging_config import get_logger
@@ -25,12 +32,35 @@ async def rag_assistant_node(state: State) -> State:
         state["response_status"] = "failed"
         return state
 
+    start_time = time.perf_counter()
+    language = detect_language(query)
+    query_embedding = None
+
+    # Reuse a cached answer for a semantically identical question
+    if answer_cache.enabled:
+        try:
+            query_embedding = await embed_text_cached(query, is_query=True)
+            cached = await answer_cache.lookup(query_embedding, language, state.get("user_id"))
+        except Exception as e:
+            logger.error(f"Answer cache unavailable: {e}")
+            cached = None
+
+        if cached:
+            state['response'] = cached["answer"]
+            state["response_status"] = "success"
+            answer_cache.record_hit_latency(time.perf_counter() - start_time)
+            return {
+                **state,
+                'messages': [HumanMessage(content=state["query"]), AIMessage(content=state["response"])]
+            }
+
     try:
-        model = get_chat_model()
-        # Define tools
-        tools = [vector_search]
-        # Create ReAct agent
-        react_agent = create_react_agent(model, tools=tools)
+        # Collect document ids retrieved by vector_search for this request
+        source_ids = []
+        retrieved_source_ids.set(source_ids)
+
+        # Shared ReAct agent (cached per model/temperature/tools)
+        react_agent = get_react_agent([vector_search])
 
         system_prompt = SYSTEM_PROMPT.format_map({"user_name": user_name})
 
@@ -41,9 +71,9 @@ async def rag_assistant_node(state: State) -> State:
             HumanMessage(content=state.get("query"))
         ]
 
-        response = await react_agent.ainvoke({
+        response = await job_queue.run("llm", lambda: react_agent.ainvoke({
             "messages": messages
-        })
+        }))
 
         if response:
             content = response["messages"][-1].content
@@ -52,6 +82,11 @@ async def rag_assistant_node(state: State) -> State:
             new_human_message = HumanMessage(content=state["query"])
             new_ai_message = AIMessage(content=state["response"])
             state["response_status"] = "success"
+
+            answer_cache.record_miss_latency(time.perf_counter() - start_time)
+            if query_embedding is not None:
+                await answer_cache.store(query_embedding, query, language, content, source_ids, state.get("user_id"))
+
             return {
                 **state, 
                 'messages': [new_human_message, new_ai_message]
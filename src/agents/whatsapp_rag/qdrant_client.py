@@ -5,9 +5,11 @@ from typing import Optional, List, Dict, Any
 from uuid import uuid4
 from langchain_core.messages import HumanMessage, AIMessage
 from qdrant_client import AsyncQdrantClient
-from qdrant_client.http.models import PointStruct, Filter, FieldCondition, MatchValue, VectorParams
+from qdrant_client.http.models import PointStruct, Filter, FieldCondition, MatchValue, VectorParams, FilterSelector
 
 from src.agents.whatsapp_rag.settings import settings
+from src.core.metrics import timed
+from src.utils.qdrant_db import upsert_in_batches
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
 
@@ -32,6 +34,7 @@ class AsyncQdrantManager:
                     )
 
                     await self._ensure_collection(self.collection_name, settings.VECTOR_SIZE, settings.DISTANCE)
+                    await self._ensure_collection(settings.ANSWER_CACHE_COLLECTION, settings.VECTOR_SIZE, settings.DISTANCE)
                     logger.info("Qdrant connection established")
 
                 except Exception as e:
@@ -77,8 +80,27 @@ class AsyncQdrantManager:
         await self._client.upsert(collection_name=collection_name, points=[point])
         # logger.info(f"Saved message embedding for user={payload.get('user_id')}, thread={payload.get('thread_id')}")
 
+    async def upsert_points(self, points: List[PointStruct], collection_name=settings.COLLECTION_NAME, wait: bool = True):
+        """Upsert prepared points in size-bounded, pipelined chunks (see upsert_in_batches)"""
+        if not self.is_connected:
+            await self.connect()
+        await upsert_in_batches(self._client, points, collection_name, wait=wait)
+
+    # ------------------ DELETE ------------------
+    async def delete_points(self, collection_name=settings.COLLECTION_NAME, point_ids: Optional[List[str]] = None, query_filter: Optional[Filter] = None):
+        """Delete points by id list or by filter (all points when neither is given)"""
+        if not self.is_connected:
+            await self.connect()
+
+        if point_ids is not None:
+            selector = point_ids
+        else:
+            selector = FilterSelector(filter=query_filter or Filter())
+        await self._client.delete(collection_name=collection_name, points_selector=selector)
+
     # ------------------ SEARCH ------------------
-    async def search_embedding(self, embedding: List[float], limit=15, collection_name=settings.COLLECTION_NAME):
+    @timed("qdrant.search_embedding")
+    async def search_embedding(self, embedding: List[float], limit=15, collection_name=settings.COLLECTION_NAME, with_ids: bool = False):
         """Retrieve most relevant past messages for a user"""
         if not self.is_connected:
             await self.connect()
@@ -90,8 +112,24 @@ class AsyncQdrantManager:
             query_vector=query_vector,
             limit=limit,
         )
+        if with_ids:
+            return [{"id": str(hit.id), **hit.payload} for hit in results]
         return [hit.payload for hit in results]
 
+    @timed("qdrant.search_points")
+    async def search_points(self, embedding: List[float], collection_name: str, limit=1, query_filter: Optional[Filter] = None, score_threshold: Optional[float] = None):
+        """Raw scored search on any collection"""
+        if not self.is_connected:
+            await self.connect()
+
+        return await self._client.search(
+            collection_name=collection_name,
+            query_vector=embedding,
+            limit=limit,
+            query_filter=query_filter,
+            score_threshold=score_threshold,
+        )
+
 
 # Singleton manager
 qdrant_manager = AsyncQdrantManager()
\ No newline at end of file
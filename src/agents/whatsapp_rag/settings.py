@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from qdrant_client.http.models import Distance
 
@@ -38,12 +39,30 @@ class Settings(BaseSettings):
     LANGSMITH_ENDPOINT: str 
     LANGSMITH_PROJECT: str 
 
+    # Query embedding cache (vector_search)
+    QUERY_CACHE_SIZE: int = 1024
+    QUERY_CACHE_TTL_SECONDS: int = 3600
+    QUERY_CACHE_DISK_PATH: Optional[Path] = None  # e.g. Path("cache/query_embeddings.db")
+
+    # Semantic answer cache (rag_assistant_node)
+    ANSWER_CACHE_ENABLED: bool = False  # entries are per user; opt in where repeat questions are common
+    ANSWER_CACHE_COLLECTION: str = "rag_answer_cache"
+    ANSWER_CACHE_THRESHOLD: float = 0.95  # cosine similarity needed to reuse an answer
+    ANSWER_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+
     # Easyocr Languages list
     EASYOCR_LANGUAGES: list = ['en']
 
     # Document settings
     DATA_DIR: Path = Path("data/docs")
 
+    # Ingestion settings
+    INGEST_WORKERS: int = 4  # parser/OCR processes
+    INGEST_CHUNK_SIZE: int = 1000  # characters
+    INGEST_CHUNK_OVERLAP: int = 150
+    INGEST_EMBED_BATCH_SIZE: int = 128
+    INGEST_MANIFEST_PATH: Path = Path("data/ingest_manifest.json")
+
     # category list
     CATEGORY_LIST: list = [
         "HR",
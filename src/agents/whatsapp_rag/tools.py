@@ -1,17 +1,22 @@
 from langchain_core.tools import tool
 
-from src.agents.whatsapp_rag.embeddings import embed_text
+from src.agents.whatsapp_rag.embeddings import embed_text_cached
 from src.agents.whatsapp_rag.qdrant_client import qdrant_manager
+from src.agents.whatsapp_rag.answer_cache import retrieved_source_ids
 
 @tool
 async def vector_search(query: str) -> list:
     """Tool to perform vector search in the document embeddings."""
     try:
-        query_embedding = await embed_text(query)
+        query_embedding = await embed_text_cached(query)
+        results = await qdrant_manager.search_embedding(query_embedding, with_ids=True)
 
-        results = await qdrant_manager.search_embedding(query_embedding)
+        # Remember sources for the answer cache
+        source_ids = retrieved_source_ids.get()
+        if source_ids is not None:
+            source_ids.extend(r["id"] for r in results)
 
         # Implement vector search logic here
-        return results
+        return [{k: v for k, v in r.items() if k != "id"} for r in results]
     except Exception as e:
-        return f"Error occurred during vector search: {e}"
\ No newline at end of file
+        return f"Error occurred during vector search: {e}"
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import time
+from typing import List, Dict, Any
+
+import numpy as np
+
+from src.core.settings import settings
+from src.core.logging_config import get_logger
+logger = get_logger(__name__)
+
+FRAME_MS = 20  # analysis frame for silence detection
+PAD_MS = 200  # audio kept around trimmed speech
+
+
+async def _ffmpeg(args: List[str], input_bytes: bytes = None) -> bytes:
+    """Run ffmpeg and return stdout"""
+    process = await asyncio.create_subprocess_exec(
+        settings.FFMPEG_PATH, "-nostdin", "-loglevel", "error", *args,
+        stdin=asyncio.subprocess.PIPE if input_bytes is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate(input_bytes)
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='ignore').strip()}")
+    return stdout
+
+
+async def decode_audio(path: str, sample_rate: int) -> np.ndarray:
+    """Decode any ffmpeg-readable audio (ogg/opus, mp3, ...) to mono int16 PCM"""
+    pcm = await _ffmpeg(["-i", path, "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "-"])
+    return np.frombuffer(pcm, dtype=np.int16)
+
+
+async def encode_flac(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Lossless, compact upload format for Whisper"""
+    return await _ffmpeg(
+        ["-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "-i", "-", "-f", "flac", "-"],
+        input_bytes=samples.tobytes(),
+    )
+
+
+def frame_levels(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """RMS level in dBFS of each FRAME_MS frame"""
+    frame = sample_rate * FRAME_MS // 1000
+    count = len(samples) // frame
+    if count == 0:
+        return np.empty(0)
+    frames = samples[:count * frame].astype(np.float32).reshape(count, frame) / 32768.0
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int, threshold_db: float) -> np.ndarray:
+    """Strip leading and trailing frames quieter than threshold_db (keeps PAD_MS around speech)"""
+    levels = frame_levels(samples, sample_rate)
+    voiced = np.nonzero(levels > threshold_db)[0]
+    if len(voiced) == 0:
+        return samples[:0]
+
+    frame = sample_rate * FRAME_MS // 1000
+    pad = sample_rate * PAD_MS // 1000
+    start = max(0, voiced[0] * frame - pad)
+    end = min(len(samples), (voiced[-1] + 1) * frame + pad)
+    return samples[start:end]
+
+
+def split_on_silence(samples: np.ndarray, sample_rate: int, max_seconds: float, search_seconds: float = 5.0) -> List[np.ndarray]:
+    """
+    Split into chunks of at most max_seconds, cutting at the quietest frame
+    in the last search_seconds of each window so words are not cut in half.
+    """
+    max_len = int(max_seconds * sample_rate)
+    if len(samples) <= max_len:
+        return [samples]
+
+    frame = sample_rate * FRAME_MS // 1000
+    search_len = min(int(search_seconds * sample_rate), max_len // 2)
+    chunks = []
+    start = 0
+    while len(samples) - start > max_len:
+        window_start = start + max_len - search_len
+        levels = frame_levels(samples[window_start:start + max_len], sample_rate)
+        cut = window_start + int(np.argmin(levels)) * frame if len(levels) else start + max_len
+        chunks.append(samples[start:cut])
+        start = cut
+    chunks.append(samples[start:])
+    return chunks
+
+
+class AudioMetrics:
+    """Totals of audio in (duration, bytes) vs audio uploaded after preprocessing"""
+
+    def __init__(self):
+        self.files = 0
+        self.chunks = 0
+        self.seconds_in = 0.0
+        self.seconds_out = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.processing_seconds = 0.0
+
+    def record(self, result: Dict[str, Any]):
+        self.files += 1
+        self.chunks += len(result["chunks"])
+        self.seconds_in += result["duration_in"]
+        self.seconds_out += result["duration_out"]
+        self.bytes_in += result["bytes_in"]
+        self.bytes_out += result["bytes_out"]
+        self.processing_seconds += result["seconds"]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "files": self.files,
+            "chunks": self.chunks,
+            "audio_seconds_in": round(self.seconds_in, 1),
+            "audio_seconds_out": round(self.seconds_out, 1),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_out_per_audio_second": round(self.bytes_out / self.seconds_out) if self.seconds_out else 0,
+            "avg_processing_s": self.processing_seconds / self.files if self.files else 0.0,
+        }
+
+
+audio_metrics = AudioMetrics()
+
+
+async def preprocess_audio(path: str) -> Dict[str, Any]:
+    """
+    Prepare a voice note for transcription:
+    decode to 16 kHz mono -> trim leading/trailing silence -> split long
+    audio at pauses -> encode each chunk as FLAC.
+    Returns the encoded chunks (in order) with duration/size metrics.
+    """
+    start_time = time.perf_counter()
+    sample_rate = settings.AUDIO_SAMPLE_RATE
+
+    samples = await decode_audio(path, sample_rate)
+    trimmed = trim_silence(samples, sample_rate, settings.AUDIO_SILENCE_THRESHOLD_DB)
+    pieces = split_on_silence(trimmed, sample_rate, settings.AUDIO_CHUNK_SECONDS) if len(trimmed) else []
+    chunks = await asyncio.gather(*(encode_flac(piece, sample_rate) for piece in pieces))
+
+    result = {
+        "chunks": list(chunks),
+        "duration_in": len(samples) / sample_rate,
+        "duration_out": len(trimmed) / sample_rate,
+        "bytes_in": os.path.getsize(path),
+        "bytes_out": sum(len(chunk) for chunk in chunks),
+        "seconds": time.perf_counter() - start_time,
+    }
+    audio_metrics.record(result)
+    logger.info(
+        f"Preprocessed {os.path.basename(path)}: {result['duration_in']:.1f}s -> {result['duration_out']:.1f}s, "
+        f"{result['bytes_in']} -> {result['bytes_out']} bytes in {len(chunks)} chunks"
+    )
+    return result
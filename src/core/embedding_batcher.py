@@ -0,0 +1,143 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class EmbeddingBatcher:
+    """
+    Coalesce concurrent embedding requests into batched encode calls.
+    - Requests are queued and grouped until `max_batch_size` items or `max_wait_ms` elapsed.
+    - Each batch is encoded in one call on a dedicated single-thread executor.
+    - `encode_fn` is synchronous: list of inputs -> list of vectors (same order).
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[Any]], List[List[float]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "embeddings",
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}-encoder")
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # metrics
+        self._batches = 0
+        self._items = 0
+        self._largest_batch = 0
+        self._total_wait = 0.0
+        self._max_wait_seen = 0.0
+        self._total_encode = 0.0
+
+    def _ensure_worker(self):
+        """Start the batching worker on the running loop (lazily, first call)"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(), name=f"{self.name}-batcher")
+
+    async def embed(self, item: Any) -> List[float]:
+        """Embed a single input"""
+        return (await self.embed_many([item]))[0]
+
+    async def embed_many(self, items: Sequence[Any]) -> List[List[float]]:
+        """Embed many inputs; they share batches with concurrent callers"""
+        if not items:
+            return []
+        self._ensure_worker()
+
+        loop = asyncio.get_running_loop()
+        enqueued_at = time.perf_counter()
+        futures = []
+        for item in items:
+            future = loop.create_future()
+            self._queue.put_nowait((item, future, enqueued_at))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    async def _next_batch(self) -> list:
+        """Wait for the first request, then collect more until size/time window closes"""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            batch = [entry for entry in batch if not entry[1].done()]
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            for _, _, enqueued_at in batch:
+                wait = started - enqueued_at
+                self._total_wait += wait
+                self._max_wait_seen = max(self._max_wait_seen, wait)
+
+            inputs = [item for item, _, _ in batch]
+            try:
+                vectors = await self._loop.run_in_executor(self._executor, self.encode_fn, inputs)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self._total_encode += time.perf_counter() - started
+            self._batches += 1
+            self._items += len(batch)
+            self._largest_batch = max(self._largest_batch, len(batch))
+
+            for (_, future, _), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch size, queue depth and wait-time metrics"""
+        return {
+            "name": self.name,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": self._items / self._batches if self._batches else 0.0,
+            "max_batch_size": self._largest_batch,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "avg_wait_ms": self._total_wait / self._items * 1000 if self._items else 0.0,
+            "max_wait_ms": self._max_wait_seen * 1000,
+            "avg_encode_ms": self._total_encode / self._batches * 1000 if self._batches else 0.0,
+        }
+
+    async def close(self):
+        """Stop the worker and fail any pending requests"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+            self._worker = None
+
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError(f"{self.name} batcher closed"))
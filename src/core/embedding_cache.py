@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize, casefold and collapse whitespace so near-identical queries share a key"""
+    text = unicodedata.normalize("NFKC", text)
+    return re.sub(r"\s+", " ", text).strip().casefold()
+
+
+class AsyncEmbeddingCache:
+    """
+    Bounded LRU cache with TTL for embedding vectors.
+    - Key: normalized text + model name + prefix.
+    - Concurrent misses for the same key share a single embedding call.
+    - Optional SQLite tier (`disk_path`) keeps vectors across restarts.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 3600,
+        disk_path: Optional[Union[str, Path]] = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self.disk_path = Path(disk_path) if disk_path else None
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (created_at, vector)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+        # metrics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str, model: str, prefix: str = "") -> str:
+        raw = f"{model}\x00{prefix}\x00{normalize_text(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ------------------ MEMORY TIER ------------------
+    def _memory_get(self, key: str) -> Optional[List[float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created_at, vector = entry
+        if time.time() - created_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return vector
+
+    def _memory_put(self, key: str, vector: List[float], created_at: float):
+        self._entries[key] = (created_at, vector)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    # ------------------ DISK TIER ------------------
+    def _disk(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.disk_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, created_at REAL, vector TEXT)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _disk_get(self, key: str) -> Optional[tuple]:
+        with self._db_lock:
+            row = self._disk().execute(
+                "SELECT created_at, vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[0] > self.ttl:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _disk_put(self, key: str, vector: List[float], created_at: float):
+        with self._db_lock:
+            db = self._disk()
+            db.execute(
+                "INSERT OR REPLACE INTO embeddings (key, created_at, vector) VALUES (?, ?, ?)",
+                (key, created_at, json.dumps(vector))
+            )
+            db.commit()
+
+    # ------------------ API ------------------
+    async def get_or_embed(
+        self,
+        text: str,
+        model: str,
+        embed_fn: Callable[[], Awaitable[List[float]]],
+        prefix: str = "",
+    ) -> List[float]:
+        """Return cached vector for (text, model, prefix) or compute it with `embed_fn()`"""
+        key = self.make_key(text, model, prefix)
+
+        vector = self._memory_get(key)
+        if vector is not None:
+            self.memory_hits += 1
+            return vector
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.memory_hits += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            entry = await asyncio.to_thread(self._disk_get, key) if self.disk_path else None
+            if entry is not None:
+                self.disk_hits += 1
+                created_at, vector = entry
+            else:
+                self.misses += 1
+                created_at, vector = time.time(), await embed_fn()
+                if self.disk_path:
+                    await asyncio.to_thread(self._disk_put, key, vector, created_at)
+
+            self._memory_put(key, vector, created_at)
+            future.set_result(vector)
+            return vector
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            del self._inflight[key]
+
+    def clear(self):
+        self._entries.clear()
+        if self.disk_path:
+            with self._db_lock:
+                db = self._disk()
+                db.execute("DELETE FROM embeddings")
+                db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
@@ -1,41 +1,78 @@
 import asyncio
-from sentence_transformers import SentenceTransformer
-import torch
 from PIL import Image
-from transformers import CLIPProcessor, CLIPModel
 
+from src.core.embedding_batcher import EmbeddingBatcher
+from src.core.model_registry import model_registry
+from src.core.model_client import model_client, encode_image
+from src.core.metrics import timed
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
-# # Save it locally wherever you want
-# model.save("models/all-MiniLM-L6-v2")
+# Batching window shared by all text/image batchers
+EMBED_BATCH_MAX_SIZE = 32
+EMBED_BATCH_MAX_WAIT_MS = 5.0
 
-# Load CLIP once
-clip_processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
-clip_model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
 
+# MiniLM and CLIP are loaded by the model registry on first use,
+# or hosted by the shared model server when MODEL_BACKEND="server"
+
+def _encode_texts(texts: list) -> list:
+    if model_client.enabled:
+        return model_client.request("embed", model="minilm", inputs=texts)
+    model = model_registry.get("minilm")
+    return model.encode(texts, batch_size=len(texts)).tolist()
+
+def _encode_images(images: list) -> list:
+    if model_client.enabled:
+        return model_client.request("embed_image", images=[encode_image(image) for image in images])
+
+    import torch
+    clip_processor, clip_model = model_registry.get("clip")
+
+    inputs = clip_processor(images=images, return_tensors="pt")
+    with torch.no_grad():
+        image_emb = clip_model.get_image_features(**inputs)
+
+    # Normalize and convert to list for Qdrant
+    image_emb = image_emb / image_emb.norm(p=2, dim=-1, keepdim=True)
+    return image_emb.tolist()
+
+
+text_batcher = EmbeddingBatcher(
+    _encode_texts,
+    max_batch_size=EMBED_BATCH_MAX_SIZE,
+    max_wait_ms=EMBED_BATCH_MAX_WAIT_MS,
+    name="minilm",
+)
+image_batcher = EmbeddingBatcher(
+    _encode_images,
+    max_batch_size=EMBED_BATCH_MAX_SIZE,
+    max_wait_ms=EMBED_BATCH_MAX_WAIT_MS,
+    name="clip",
+)
+
+
+@timed("embed_text.minilm")
 async def embed_text(text: str):
-    # Wrap in asyncio to avoid blocking
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, lambda: model.encode(text).tolist())
+    # Queued and encoded together with concurrent requests
+    return await text_batcher.embed(text)
 
+@timed("embed_text.minilm")
 async def _embed_text(text: str):
-    # Wrap in asyncio to avoid blocking
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, lambda: model.encode(text).tolist())
+    # Queued and encoded together with concurrent requests
+    return await text_batcher.embed(text)
+
+@timed("embed_texts.minilm")
+async def _embed_texts(texts: list):
+    # Batch variant of _embed_text, one vector per input text
+    return await text_batcher.embed_many(texts)
 
+@timed("embed_image.clip")
 async def _embed_image(image_input):
 
     if isinstance(image_input, str):  # file path
-        image = Image.open(image_input).convert("RGB")
+        image = await asyncio.to_thread(lambda: Image.open(image_input).convert("RGB"))
     elif isinstance(image_input, Image.Image):  # already a PIL Image
         image = image_input
     else:
         raise ValueError("image_input must be a file path or PIL.Image")
-    
-    inputs = clip_processor(images=image, return_tensors="pt")
-    with torch.no_grad():
-        image_emb = clip_model.get_image_features(**inputs)
 
-    # Normalize and convert to list for Qdrant
-    image_emb = image_emb / image_emb.norm(p=2, dim=-1, keepdim=True)
-    return image_emb.squeeze().tolist()
+    return await image_batcher.embed(image)
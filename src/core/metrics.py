@@ -0,0 +1,136 @@
+"""
+Dependency-free latency metrics.
+
+Histograms are rendered in the Prometheus text format on /metrics, and the
+timings of the current request are collected in a context variable so they
+can be returned in a Server-Timing header. Nothing here talks to the network.
+
+Kept free of src.core.settings imports: src.core.embeddings (imported by
+settings) uses the timers.
+"""
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, List, Tuple, Sequence, Callable
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# (name, seconds) entries recorded while handling the current request
+request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels (thread-safe, extractors run in threads)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], Dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str):
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+                self._series[labelvalues] = series
+            series["counts"][bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labelvalues, series in sorted(self._series.items()):
+                labels = ",".join(f'{k}="{v}"' for k, v in zip(self.labelnames, labelvalues))
+                prefix = labels + "," if labels else ""
+                cumulative = 0
+                for bound, count in zip(self.buckets, series["counts"]):
+                    cumulative += count
+                    lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series["count"]}')
+                suffix = f"{{{labels}}}" if labels else ""
+                lines.append(f"{self.name}_sum{suffix} {series['sum']}")
+                lines.append(f"{self.name}_count{suffix} {series['count']}")
+        return lines
+
+
+REQUEST_DURATION = Histogram("whatsapp_request_duration_seconds", "HTTP request latency", ["method", "route"])
+NODE_DURATION = Histogram("whatsapp_node_duration_seconds", "LangGraph node latency", ["graph", "node"])
+OPERATION_DURATION = Histogram(
+    "whatsapp_operation_duration_seconds",
+    "Latency of embedding, vector search, database, checkpointer and extraction calls",
+    ["operation"]
+)
+
+
+def _record(name: str, seconds: float):
+    timings = request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+@contextmanager
+def timer(operation: str):
+    """Time a block as `operation` (works around awaits too)"""
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start_time
+        OPERATION_DURATION.observe(seconds, operation)
+        _record(operation, seconds)
+
+
+def timed(operation: str):
+    """Decorator version of `timer` for sync and async functions"""
+    def decorator(fn: Callable):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with timer(operation):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(operation):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_node(graph: str, node: str, fn: Callable):
+    """Wrap an async LangGraph node (state -> state) to record its latency"""
+    async def wrapper(state):
+        start_time = time.perf_counter()
+        try:
+            return await fn(state)
+        finally:
+            seconds = time.perf_counter() - start_time
+            NODE_DURATION.observe(seconds, graph, node)
+            _record(f"{graph}.{node}", seconds)
+    wrapper.__name__ = getattr(fn, "__name__", node)
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
+
+
+def server_timing(timings: List[Tuple[str, float]]) -> str:
+    """Server-Timing header value; repeated entries are summed, durations in ms"""
+    totals: Dict[str, float] = {}
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ", ".join(f"{name.replace(' ', '_')};dur={seconds * 1000:.1f}" for name, seconds in totals.items())
+
+
+def render_metrics() -> str:
+    lines = []
+    for histogram in (REQUEST_DURATION, NODE_DURATION, OPERATION_DURATION):
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,124 @@
+import base64
+import io
+import json
+import socket
+import struct
+import threading
+from typing import Any, Dict, Optional
+
+# Frames are a 4-byte big-endian length followed by a UTF-8 JSON body
+FRAME_HEADER = struct.Struct(">I")
+
+
+def send_frame(sock: socket.socket, payload: Dict[str, Any]):
+    body = json.dumps(payload).encode("utf-8")
+    sock.sendall(FRAME_HEADER.pack(len(body)) + body)
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("Model server closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def recv_frame(sock: socket.socket) -> Dict[str, Any]:
+    (size,) = FRAME_HEADER.unpack(_recv_exact(sock, FRAME_HEADER.size))
+    return json.loads(_recv_exact(sock, size).decode("utf-8"))
+
+
+def encode_image(image) -> Dict[str, str]:
+    """Serialize a file path, PIL image or numpy array for the model server"""
+    if isinstance(image, str):
+        # server runs on the same host, so it can read the file directly
+        return {"path": image}
+
+    from PIL import Image
+    if not isinstance(image, Image.Image):
+        image = Image.fromarray(image)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return {"png": base64.b64encode(buffer.getvalue()).decode("ascii")}
+
+def decode_image(data: Dict[str, str]):
+    """Inverse of encode_image: returns a file path or a PIL image"""
+    if "path" in data:
+        return data["path"]
+
+    from PIL import Image
+    return Image.open(io.BytesIO(base64.b64decode(data["png"]))).convert("RGB")
+
+
+def parse_address(address: str):
+    """'unix:/path/to.sock' -> (AF_UNIX, path), 'host:port' -> (AF_INET, (host, port))"""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+class ModelServerClient:
+    """
+    Blocking client for the shared model server.
+    - Called from executor threads (embedding batchers, OCR), so it is synchronous.
+    - Keeps one persistent connection per thread and reconnects once on failure.
+    - `enabled` is read lazily from settings (MODEL_BACKEND == "server").
+    """
+
+    def __init__(self, address: Optional[str] = None, timeout: float = 120.0):
+        self._address = address
+        self.timeout = timeout
+        self._local = threading.local()
+        self._enabled: Optional[bool] = None
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is None:
+            # imported here: src.core.settings imports this module via src.core.embeddings
+            from src.core.settings import settings
+            self._enabled = settings.MODEL_BACKEND == "server"
+            self._address = self._address or settings.MODEL_SERVER_ADDRESS
+        return self._enabled
+
+    def _connect(self) -> socket.socket:
+        family, address = parse_address(self._address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(address)
+        self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            finally:
+                self._local.sock = None
+
+    def request(self, op: str, **kwargs) -> Any:
+        """Send one request and return its result, raising RuntimeError on server errors"""
+        if self._address is None:
+            self.enabled  # resolve address from settings
+
+        payload = {"op": op, **kwargs}
+        for attempt in range(2):
+            sock = getattr(self._local, "sock", None) or self._connect()
+            try:
+                send_frame(sock, payload)
+                response = recv_frame(sock)
+                break
+            except (OSError, ConnectionError):
+                self._close()
+                if attempt:
+                    raise
+
+        if "error" in response:
+            raise RuntimeError(f"Model server error: {response['error']}")
+        return response["result"]
+
+
+# Singleton client
+model_client = ModelServerClient()
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+def _rss_mb() -> Optional[float]:
+    """Resident memory of this process in MB (None if it cannot be determined)"""
+    try:
+        import psutil  # optional
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+# ------------------ LOADERS ------------------
+# Heavy libraries are imported inside loaders so importing this module stays cheap.
+
+def _load_minilm():
+    from sentence_transformers import SentenceTransformer
+    from src.core.settings import settings
+    return SentenceTransformer(settings.EMBEDDING_MODEL)
+
+def _load_clip():
+    from transformers import CLIPProcessor, CLIPModel
+    clip_processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+    clip_model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
+    return clip_processor, clip_model
+
+def _load_e5_large():
+    from sentence_transformers import SentenceTransformer
+    from src.agents.whatsapp_rag.embeddings import MODEL_NAME
+    return SentenceTransformer(MODEL_NAME)
+
+def _load_easyocr():
+    from easyocr import Reader
+    from src.core.settings import settings
+    return Reader(settings.EASYOCR_LANGUAGES, gpu=False)  # use CPU
+
+def _load_whisper():
+    from faster_whisper import WhisperModel  # optional, only for TRANSCRIPTION_BACKEND="local"
+    from src.core.settings import settings
+    return WhisperModel(settings.LOCAL_WHISPER_MODEL, device="cpu", compute_type="int8")
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of lazily loaded models.
+    - A model is loaded on first `get()` and shared by every caller in the process.
+    - Loading is thread-safe (callers run in executor threads) and per-model, so
+      two different models can load in parallel.
+    - Load time and resident memory growth are recorded per model.
+    """
+
+    def __init__(self, loaders: Dict[str, Callable[[], Any]]):
+        self._loaders = dict(loaders)
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Register (or replace) a model loader"""
+        with self._lock:
+            self._loaders[name] = loader
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get(self, name: str) -> Any:
+        """Return model by name, loading it on first use"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+
+        with lock:
+            if name not in self._models:
+                # imported here: src.core.settings imports this module via src.core.embeddings
+                from src.core.logging_config import get_logger
+                logger = get_logger(__name__)
+                logger.info(f"Loading model '{name}'...")
+
+                rss_before = _rss_mb()
+                start_time = time.perf_counter()
+                self._models[name] = self._loaders[name]()
+                load_seconds = time.perf_counter() - start_time
+                rss_after = _rss_mb()
+
+                self._stats[name] = {
+                    "load_seconds": round(load_seconds, 3),
+                    "rss_delta_mb": round(rss_after - rss_before, 1) if rss_before is not None and rss_after is not None else None,
+                }
+                logger.info(f"Model '{name}' loaded in {load_seconds:.2f} seconds")
+            return self._models[name]
+
+    async def warm_up(self, names: Iterable[str]):
+        """Load the given models in the background thread pool"""
+        await asyncio.gather(*(asyncio.to_thread(self.get, name) for name in names))
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-model load state/time/memory and current process RSS"""
+        rss = _rss_mb()
+        return {
+            "rss_mb": round(rss, 1) if rss is not None else None,
+            "models": {
+                name: {"loaded": self.is_loaded(name), **self._stats.get(name, {})}
+                for name in self._loaders
+            },
+        }
+
+
+# Singleton registry
+model_registry = ModelRegistry({
+    "minilm": _load_minilm,
+    "clip": _load_clip,
+    "e5-large": _load_e5_large,
+    "easyocr": _load_easyocr,
+    "whisper": _load_whisper,
+})
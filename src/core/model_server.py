@@ -0,0 +1,103 @@
+"""
+Shared model server: hosts the embedding, CLIP and OCR models once per host.
+
+Usage:
+    python -m src.core.model_server
+
+API workers use it when MODEL_BACKEND="server"; requests from all workers
+share the same embedding batchers, so they are batched across workers too.
+"""
+import asyncio
+import json
+import os
+import sys
+
+# This process always runs the models itself
+os.environ["MODEL_BACKEND"] = "local"
+
+from src.core.settings import settings
+from src.core.model_client import parse_address, decode_image, FRAME_HEADER
+from src.core.model_registry import model_registry
+from src.core.embeddings import text_batcher, image_batcher
+from src.agents.whatsapp_rag.embeddings import batcher as rag_batcher
+from src.agents.document_parser.tools.easy_ocr import easyocr_extractor
+
+from src.core.logging_config import get_logger
+logger = get_logger(__name__)
+
+TEXT_BATCHERS = {
+    "minilm": text_batcher,
+    "e5-large": rag_batcher,
+}
+
+# EasyOCR is not batched; bound concurrent OCR calls instead
+_ocr_semaphore = asyncio.Semaphore(1)
+
+
+async def _handle_request(request: dict):
+    op = request.get("op")
+
+    if op == "embed":
+        batcher = TEXT_BATCHERS[request["model"]]
+        return await batcher.embed_many(request["inputs"])
+
+    if op == "embed_image":
+        images = [decode_image(image) for image in request["images"]]
+        return await image_batcher.embed_many(images)
+
+    if op == "ocr":
+        async with _ocr_semaphore:
+            return await asyncio.to_thread(easyocr_extractor, decode_image(request["image"]))
+
+    if op == "stats":
+        return {
+            **model_registry.stats(),
+            "batchers": [b.stats() for b in (text_batcher, image_batcher, rag_batcher)],
+        }
+
+    raise ValueError(f"Unknown op: {op}")
+
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Serve framed JSON requests from one client connection until it closes"""
+    try:
+        while True:
+            try:
+                header = await reader.readexactly(FRAME_HEADER.size)
+            except asyncio.IncompleteReadError:
+                break
+            (size,) = FRAME_HEADER.unpack(header)
+            request = json.loads((await reader.readexactly(size)).decode("utf-8"))
+
+            try:
+                response = {"result": await _handle_request(request)}
+            except Exception as e:
+                logger.error(f"Model server request failed: {e}")
+                response = {"error": str(e)}
+
+            body = json.dumps(response).encode("utf-8")
+            writer.write(FRAME_HEADER.pack(len(body)) + body)
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(address: str):
+    _, target = parse_address(address)
+    if isinstance(target, str):
+        if os.path.exists(target):
+            os.remove(target)
+        server = await asyncio.start_unix_server(_handle_connection, path=target)
+    else:
+        server = await asyncio.start_server(_handle_connection, host=target[0], port=target[1])
+
+    await model_registry.warm_up(settings.WARMUP_MODELS)
+    logger.info(f"Model server listening on {address}")
+
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    address = sys.argv[1] if len(sys.argv) > 1 else settings.MODEL_SERVER_ADDRESS
+    asyncio.run(serve(address))
@@ -4,6 +4,7 @@ from qdrant_client.http.models import Distance
 
 from src.core.embeddings import (
     _embed_text,
+    _embed_texts,
     _embed_image,
 )
 
@@ -16,6 +17,20 @@ class Settings(BaseSettings):
     # temp data directory
     DATA_DIR: str = "data"
 
+    # Media download settings
+    MAX_DOWNLOAD_BYTES: int = 50 * 1024 * 1024
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_TIMEOUT_SECONDS: int = 60
+
+    # Background job queue: worker count and max waiting jobs per job type
+    JOB_POOLS: dict = {
+        "chat": {"concurrency": 16, "max_queue": 200},
+        "ocr": {"concurrency": 2, "max_queue": 50},
+        "transcription": {"concurrency": 4, "max_queue": 100},
+        "llm": {"concurrency": 8, "max_queue": 200},
+    }
+    JOB_RESULT_TTL_SECONDS: int = 3600
+
     GROQ_API_KEY: str
 
     # Postgres DB settings
@@ -24,17 +39,26 @@ class Settings(BaseSettings):
     CLIENT_SCHEMA_NAME: str = "dbo"
     MSSQL_DATABASE_DSN: str
 
+    # Checkpointer connection pool settings
+    PG_POOL_MIN_SIZE: int = 2
+    PG_POOL_MAX_SIZE: int = 20
+    CHECKPOINTER_BACKEND: str = "postgres"  # or "sqlite" for local runs / load tests
+    CHECKPOINTER_SQLITE_PATH: str = "checkpoints.sqlite"
+
     # QDrant Vector DB settings
     QDRANT_URL: str
     QDRANT_API_KEY: str = ""
     COLLECTION_NAME: str = "whatsapp_agent"
     EMBEDDING_DIM: int = 384
+    QDRANT_UPSERT_BATCH_SIZE: int = 256
+    QDRANT_UPSERT_CONCURRENCY: int = 4
 
     COLLECTIONS_CONFIG: dict = {
         "whatsapp_agent": {
                 "dim": 384,  # e.g. settings.EMBEDDING_DIM
                 "distance": Distance.COSINE,
-                "embed_fn": _embed_text
+                "embed_fn": _embed_text,
+                "embed_batch_fn": _embed_texts
             },
         "image_products": {
             "dim": 512,  # depends on your image encoder
@@ -43,13 +67,30 @@ class Settings(BaseSettings):
         }
     }
 
+    # Nightly archiver settings
+    ARCHIVE_FETCH_CONCURRENCY: int = 8
+    ARCHIVE_BATCH_THREADS: int = 16
+
     # LLM Models
     QWEN_LLM: str = "qwen/qwen3-32b"
     OPENAI_GPT_120: str = "openai/gpt-oss-120b"
     OPENAI_GPT_20: str = "openai/gpt-oss-20b"
     TEMPERATURE: float = 0.7
+    LLM_HTTP_POOL_LIMIT: int = 50  # connections shared by all ChatGroq instances
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
 
+    # Models loaded during startup (others load lazily on first use)
+    # e.g. ["minilm", "clip", "e5-large", "easyocr", "whisper"]
+    WARMUP_MODELS: list = []
+
+    # "local": every worker loads its own models
+    # "server": use the shared model server (python -m src.core.model_server)
+    MODEL_BACKEND: str = "local"
+    MODEL_SERVER_ADDRESS: str = "127.0.0.1:8765"  # or "unix:/tmp/whatsapp_models.sock"
+
+    # Add a Server-Timing header with per-node/operation latency to every response
+    TIMING_HEADER: bool = False
+
     # logging settings
     DEBUG: bool = False
     LOG_LEVEL: str = "DEBUG"
@@ -64,9 +105,52 @@ class Settings(BaseSettings):
     # Audio Transcription settings
     AUDIO_EXTENSIONS: list = ["mp3", "wav", "ogg", "opus"]
     AUDIO_MODEL: str = "whisper-large-v3"
+    TRANSCRIPTION_BACKEND: str = "groq"  # "groq", "local" (faster-whisper on CPU) or "stub"
+    TRANSCRIPTION_CONCURRENCY: int = 4
+    TRANSCRIPTION_MAX_RETRIES: int = 3
+    TRANSCRIPTION_RETRY_BASE_SECONDS: float = 0.5
+    TRANSCRIPTION_TIMEOUT_SECONDS: float = 60
+    TRANSCRIPTION_LOCAL_WORKERS: int = 1
+    LOCAL_WHISPER_MODEL: str = "base"
+    TRANSCRIPTION_STUB_TEXT: str = "This is a test voice message."
+    TRANSCRIPTION_STUB_DELAY_SECONDS: float = 0.5
+
+    # Audio preprocessing before transcription (needs ffmpeg on PATH)
+    AUDIO_PREPROCESS: bool = True
+    AUDIO_SAMPLE_RATE: int = 16000
+    AUDIO_SILENCE_THRESHOLD_DB: float = -40.0  # frames quieter than this (dBFS) count as silence
+    AUDIO_CHUNK_SECONDS: int = 60  # long notes are split at pauses into chunks of at most this
+    FFMPEG_PATH: str = "ffmpeg"
 
     # Easyocr Languages list
     EASYOCR_LANGUAGES: list = ['en']
 
+    # Document parser cache (extracted text + analyzer output, keyed by content hash)
+    DOC_CACHE_ENABLED: bool = True
+    DOC_CACHE_BACKEND: str = "disk"  # "disk" or "postgres"
+    DOC_CACHE_DIR: Path = Path("cache/documents")
+    DOC_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    DOC_CACHE_VERSION: str = "5"  # bump to invalidate after extractor changes
+
+    # Scanned PDF OCR settings
+    PDF_MIN_PAGE_CHARS: int = 20  # pages with less text-layer text are OCRed
+    PDF_OCR_DPI: int = 200
+    PDF_OCR_MAX_PAGES: int = 50
+    PDF_OCR_WORKERS: int = 2  # each worker process holds its own EasyOCR reader unless MODEL_BACKEND="server"
+
+    # Excel extraction (streamed in read-only mode)
+    EXCEL_MAX_ROWS_PER_SHEET: int = 20000
+    EXCEL_MAX_COLUMNS: int = 50
+    EXCEL_OUTPUT_FORMAT: str = "table"  # "table", "records" or "text"
+
+    # DOCX extraction
+    DOCX_TOKEN_BUDGET: int = 0  # 0 = no budget; otherwise drop low-value blocks until the text fits
+    DOC_CHARS_PER_TOKEN: float = 4.0  # token estimate used for document budgets
+
+    # Document analyzer map-reduce (large documents are analyzed in chunks)
+    DOC_CHUNK_TOKENS: int = 6000  # per-chunk budget for the document text in the prompt
+    DOC_CHUNK_CONCURRENCY: int = 4  # chunks of one document in flight (the "llm" pool bounds all calls)
+    DOC_MAX_CHUNKS: int = 40
+
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,214 @@
+import asyncio
+import io
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any
+
+import aiofiles
+import groq
+
+from src.core.settings import settings
+from src.core.model_registry import model_registry
+from src.core.audio import preprocess_audio, audio_metrics
+from src.core.logging_config import get_logger
+logger = get_logger(__name__)
+
+
+# ------------------ BACKENDS ------------------
+class GroqBackend:
+    """Groq Whisper API through one AsyncGroq client (and its HTTP connection pool)"""
+
+    name = "groq"
+
+    def __init__(self, **kwargs):
+        self.model = kwargs.get('model', settings.AUDIO_MODEL)
+        self.timeout = kwargs.get('timeout', 60)
+        self._client: Optional[groq.AsyncGroq] = None
+
+    async def connect(self):
+        if self._client is None:
+            # retries are handled by the transcription client
+            self._client = groq.AsyncGroq(api_key=settings.GROQ_API_KEY, max_retries=0, timeout=self.timeout)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def transcribe(self, audio: bytes, filename: str) -> str:
+        await self.connect()
+        transcription = await self._client.audio.transcriptions.create(
+            file=(filename, audio),
+            model=self.model,
+            response_format="verbose_json",
+        )
+        return transcription.text
+
+    def is_retryable(self, error: Exception) -> bool:
+        return isinstance(error, (groq.APIConnectionError, groq.RateLimitError, groq.InternalServerError))
+
+
+class LocalWhisperBackend:
+    """CPU faster-whisper model from the model registry, for offline use and load tests"""
+
+    name = "local"
+
+    def __init__(self, **kwargs):
+        self._executor = ThreadPoolExecutor(
+            max_workers=kwargs.get('workers', 1),
+            thread_name_prefix="whisper"
+        )
+
+    async def connect(self):
+        pass
+
+    async def close(self):
+        self._executor.shutdown(wait=False)
+
+    def _transcribe(self, audio: bytes) -> str:
+        model = model_registry.get("whisper")
+        segments, _ = model.transcribe(io.BytesIO(audio))
+        return "".join(segment.text for segment in segments).strip()
+
+    async def transcribe(self, audio: bytes, filename: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._transcribe, audio)
+
+    def is_retryable(self, error: Exception) -> bool:
+        return False
+
+
+class StubBackend:
+    """Fixed transcript after a fixed delay, no network or model"""
+
+    name = "stub"
+
+    def __init__(self, **kwargs):
+        self.text = kwargs.get('text', "")
+        self.delay = kwargs.get('delay', 0.0)
+
+    async def connect(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def transcribe(self, audio: bytes, filename: str) -> str:
+        await asyncio.sleep(self.delay)
+        return self.text
+
+    def is_retryable(self, error: Exception) -> bool:
+        return False
+
+
+def create_backend(name: str):
+    if name == "groq":
+        return GroqBackend(model=settings.AUDIO_MODEL, timeout=settings.TRANSCRIPTION_TIMEOUT_SECONDS)
+    if name == "local":
+        return LocalWhisperBackend(workers=settings.TRANSCRIPTION_LOCAL_WORKERS)
+    if name == "stub":
+        return StubBackend(text=settings.TRANSCRIPTION_STUB_TEXT, delay=settings.TRANSCRIPTION_STUB_DELAY_SECONDS)
+    raise ValueError(f"Unknown transcription backend: {name}")
+
+
+# ------------------ CLIENT ------------------
+class AsyncTranscriptionClient:
+    """
+    Process-wide async transcription client.
+    - The backend (and its connection pool) is created once and reused.
+    - At most `concurrency` transcriptions are in flight.
+    - Retryable backend errors (connection, 429, 5xx) are retried with
+      exponential backoff and jitter, up to `max_retries` times.
+    """
+
+    def __init__(self, backend, **kwargs):
+        self.backend = backend
+        self.concurrency = kwargs.get('concurrency', 4)
+        self.max_retries = kwargs.get('max_retries', 3)
+        self.retry_base = kwargs.get('retry_base_seconds', 0.5)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # metrics
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self._latency_total = 0.0
+
+    async def connect(self):
+        await self.backend.connect()
+        logger.info(f"Transcription client ready (backend={self.backend.name})")
+
+    async def close(self):
+        await self.backend.close()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def transcribe(self, audio: bytes, filename: str) -> str:
+        """Transcribe audio bytes; `filename` carries the format to the API"""
+        self.requests += 1
+        attempt = 0
+        async with self._get_semaphore():
+            start_time = time.perf_counter()
+            while True:
+                try:
+                    text = await self.backend.transcribe(audio, filename)
+                    self._latency_total += time.perf_counter() - start_time
+                    return text
+                except Exception as e:
+                    if attempt >= self.max_retries or not self.backend.is_retryable(e):
+                        self.failures += 1
+                        raise
+                    delay = self.retry_base * (2 ** attempt) * (0.5 + random.random())
+                    attempt += 1
+                    self.retries += 1
+                    logger.warning(f"Transcription failed ({e}), retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+
+    async def transcribe_file(self, file_path: str) -> str:
+        """
+        Transcribe an audio file. With AUDIO_PREPROCESS the note is downsampled,
+        trimmed and split at pauses; chunks are transcribed concurrently and joined.
+        """
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        if settings.AUDIO_PREPROCESS:
+            try:
+                prepared = await preprocess_audio(file_path)
+            except (OSError, RuntimeError) as e:
+                # e.g. ffmpeg missing or unreadable file: upload the original
+                logger.warning(f"Audio preprocessing failed, sending original file: {e}")
+            else:
+                texts = await asyncio.gather(*(
+                    self.transcribe(chunk, f"{name}-{index}.flac")
+                    for index, chunk in enumerate(prepared["chunks"])
+                ))
+                return " ".join(text.strip() for text in texts if text and text.strip())
+
+        async with aiofiles.open(file_path, "rb") as f:
+            audio = await f.read()
+        return await self.transcribe(audio, os.path.basename(file_path))
+
+    def stats(self) -> Dict[str, Any]:
+        succeeded = self.requests - self.failures
+        return {
+            "backend": self.backend.name,
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "avg_latency_s": self._latency_total / succeeded if succeeded else 0.0,
+            "preprocessing": audio_metrics.stats(),
+        }
+
+
+# Singleton client
+transcriber = AsyncTranscriptionClient(
+    create_backend(settings.TRANSCRIPTION_BACKEND),
+    concurrency=settings.TRANSCRIPTION_CONCURRENCY,
+    max_retries=settings.TRANSCRIPTION_MAX_RETRIES,
+    retry_base_seconds=settings.TRANSCRIPTION_RETRY_BASE_SECONDS,
+)
@@ -1,20 +1,28 @@
 import asyncio
+import json
 import sys
+import time
 
 # Fix psycopg async issue on Windows
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, UploadFile, File
+from fastapi import FastAPI, UploadFile, File, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse, PlainTextResponse
 from langchain_core.messages import HumanMessage
-from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 
 from src.utils.db import checkpoint_db, client_db
 from src.utils.qdrant_db import qdrant_manager
 from src.core.settings import settings
-from src.core.embeddings import embed_text
-from src.agents.whatsapp.graph import build_graph
+from src.core.embeddings import embed_text, text_batcher, image_batcher
+from src.core.model_registry import model_registry
+from src.utils.graph_registry import graph_manager
+from src.utils.file_handler import http_manager, save_file, FileTooLargeError
+from src.utils.job_queue import job_queue, JobQueueFull
+from src.core.transcription import transcriber
+from src.core.metrics import REQUEST_DURATION, request_timings, server_timing, render_metrics
 from src.schedular.schedular import start_scheduler
 
 from src.utils.ms_sql_manager import client_db
@@ -23,6 +31,7 @@ from src.utils.helpers import (
     get_or_create_thread_id,
     log_conversation,
     get_conversation_history,
+    close_chat_clients,
 )
 
 from src.core.logging_config import get_logger
@@ -30,6 +39,8 @@ logger = get_logger(__name__)
 
 # for doc rag
 from src.agents.whatsapp_rag.qdrant_client import qdrant_manager as qdrant_manager_rag
+from src.agents.whatsapp_rag.embeddings import batcher as rag_batcher, query_cache
+from src.agents.whatsapp_rag.answer_cache import answer_cache
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -52,8 +63,21 @@ async def lifespan(app: FastAPI):
         # test
         await client_db.create_pool()
 
-        async with AsyncPostgresSaver.from_conn_string(settings.PG_DATABASE_URL) as saver:
-            await saver.setup()
+        # Shared HTTP connection pool for media downloads
+        await http_manager.connect()
+
+        # Initialize checkpointer pool and compile graphs once per process
+        await graph_manager.connect()
+        await graph_manager.warm_up()
+
+        # Transcription client (Groq connection pool or local/stub backend)
+        await transcriber.connect()
+
+        # Worker pools for chat, OCR, transcription and LLM jobs
+        await job_queue.start()
+
+        # Optionally preload models, the rest load lazily on first use
+        await model_registry.warm_up(settings.WARMUP_MODELS)
 
         # schedulers
         start_scheduler()
@@ -62,28 +86,109 @@ async def lifespan(app: FastAPI):
         yield
         
     finally:      
+        # Stop job workers before the pools they use are closed
+        await job_queue.stop()
+
         # Close database pool
         await checkpoint_db.close_pool()
 
         # Close qdrant database pool
         await qdrant_manager.close()
+
+        # Close checkpointer pool
+        await graph_manager.close()
+
+        # Close transcription client
+        await transcriber.close()
+
+        # Close HTTP session
+        await http_manager.close()
+
+        # Close shared LLM connection pool
+        await close_chat_clients()
+
+        # Stop embedding batchers
+        for batcher in (text_batcher, image_batcher, rag_batcher):
+            await batcher.close()
         
         print("Application shutdown complete")
 
 app = FastAPI(lifespan=lifespan)
 
+@app.middleware("http")
+async def record_timings(request: Request, call_next):
+    """
+    Request latency histogram, plus a Server-Timing header with the node and
+    operation timings of this request when TIMING_HEADER is on or the caller
+    sends "X-Timing: 1".
+    """
+    timings = []
+    token = request_timings.set(timings)
+    start_time = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        request_timings.reset(token)
+    seconds = time.perf_counter() - start_time
 
-@app.post("/chat/")
-async def chat(user_id: str, name: str, message: str = None, file: str = None):
+    route = request.scope.get("route")
+    REQUEST_DURATION.observe(seconds, request.method, route.path if route else "unmatched")
+    if settings.TIMING_HEADER or request.headers.get("x-timing") == "1":
+        response.headers["Server-Timing"] = server_timing(timings + [("total", seconds)])
+    return response
+
+
+# Graph nodes whose LLM tokens are the user-facing answer
+STREAM_NODES = {"RAGAssistantNode", "AssistantNode"}
+
+
+def _job_type(file_path: str = None) -> str:
+    """Heaviest stage a chat request will hit, used for load shedding"""
+    if not file_path:
+        return "llm"
+    if file_path.split(".")[-1].lower() in settings.AUDIO_EXTENSIONS:
+        return "transcription"
+    return "ocr"
+
+
+async def _get_chat_graph():
+    # Compiled graph shares the process-wide checkpointer pool
+    # return await graph_manager.get_graph("whatsapp")
+
+    # for doc rag
+    return await graph_manager.get_graph("whatsapp_rag")
+
+
+async def _run_chat(initial_state: dict, config: dict) -> dict:
+    graph = await _get_chat_graph()
+
+    response = await graph.ainvoke(
+        initial_state,
+        config=config,
+    )
+
+    output_message = response.get("response")
+
+    return {"response": response, "output_message": output_message}
+
+
+async def _prepare_chat(user_id: str, name: str, message: str = None, file: str = None):
+    """Download the media and build the graph input; returns (error, initial_state, config)"""
     # Save the uploaded file
     if file:
-        from src.utils.file_handler import save_file
-        file_info = await save_file(file)
+        try:
+            file_info = await save_file(file)
+        except FileTooLargeError as e:
+            return {"status": 413,
+                    "response": str(e),
+                    "output_message": "File is too large"
+                    }, None, None
         # You can access the saved file path with file_info["file_path"]
     # input_message = [HumanMessage(content=message)]
     thread_id = get_or_create_thread_id(user_id)
 
-    config = {"configurable": {"thread_id": str(thread_id)}}
+    # user_id is read by the vector_search tool from the inherited configurable
+    config = {"configurable": {"thread_id": str(thread_id), "user_id": user_id}}
 
     initial_state = {
         'thread_id': thread_id,
@@ -96,32 +201,124 @@ async def chat(user_id: str, name: str, message: str = None, file: str = None):
         return {"status": 500,
                 "response": "No input provided",
                 "output_message": "No input provided"
-                }
+                }, None, None
     if message:
         initial_state['query'] = message
     if file:
         initial_state['file'] = file_info["file_path"]
+        initial_state['file_hash'] = file_info["file_hash"]
     
     logger.debug(f"Initial State: {initial_state}")
+    return None, initial_state, config
+
+
+@app.post("/chat/")
+async def chat(user_id: str, name: str, message: str = None, file: str = None,
+               async_mode: bool = False, webhook_url: str = None):
+    """
+    Run the chat graph inline, or with async_mode/webhook_url queue it and
+    return a job id (poll /jobs/{job_id}/ or receive the result on the webhook).
+    """
+    error, initial_state, config = await _prepare_chat(user_id, name, message, file)
+    if error:
+        return error
 
-    # Use the context manager to get the actual saver
-    async with AsyncPostgresSaver.from_conn_string(settings.PG_DATABASE_URL) as saver:
-        await saver.setup()
-        # Build graph with that saver
-        # graph = await build_graph(checkpointer=saver)
+    try:
+        # Shed load early when the stage this request needs is backed up
+        job_queue.admit(_job_type(initial_state['file']))
 
-        # for doc rag
-        from src.agents.whatsapp_rag.graph import build_graph
-        graph = await build_graph(checkpointer=saver)
+        if async_mode or webhook_url:
+            async def _job():
+                return jsonable_encoder(await _run_chat(initial_state, config))
 
-        response = await graph.ainvoke(
-            initial_state,
-            config=config,
-        )
+            job_id = await job_queue.submit("chat", _job, webhook_url=webhook_url)
+            return {"status": 202,
+                    "job_id": job_id,
+                    "output_message": "Processing"
+                    }
+    except JobQueueFull as e:
+        logger.warning(f"Rejected chat request: {e}")
+        return {"status": 503,
+                "response": str(e),
+                "output_message": "Server is busy, please try again later"
+                }
 
-    output_message = response.get("response")
+    return await _run_chat(initial_state, config)
 
-    return {"response": response, "output_message": output_message}
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _stream_chat(initial_state: dict, config: dict):
+    """
+    Forward assistant LLM tokens as server-sent events while the graph runs.
+    The graph runs with its checkpointer, so the final state is saved exactly
+    as with /chat/. Events: "token" {text}, then "done" {output_message} or "error".
+    """
+    graph = await _get_chat_graph()
+    streamed = False
+    final_state = None
+    try:
+        async for event in graph.astream_events(initial_state, config=config, version="v2"):
+            kind = event["event"]
+            if kind == "on_chat_model_stream":
+                # only the answer-producing nodes (the ReAct agent runs nested inside them)
+                node = event["metadata"].get("langgraph_checkpoint_ns", "").split(":")[0]
+                text = event["data"]["chunk"].content
+                if node in STREAM_NODES and isinstance(text, str) and text:
+                    streamed = True
+                    yield _sse("token", {"text": text})
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                final_state = event["data"].get("output")
+    except Exception as e:
+        logger.error(f"Streaming chat failed: {e}")
+        yield _sse("error", {"output_message": "Something went wrong, please try again"})
+        return
+
+    output_message = (final_state or {}).get("response")
+    if output_message and not streamed:
+        # e.g. answer cache hit: nothing was generated token by token
+        yield _sse("token", {"text": output_message})
+    yield _sse("done", {"output_message": output_message})
+
+
+@app.post("/chat/stream/")
+async def chat_stream(user_id: str, name: str, message: str = None, file: str = None):
+    """Same as /chat/ but streams the answer as server-sent events for a low time-to-first-byte"""
+    error, initial_state, config = await _prepare_chat(user_id, name, message, file)
+    if error:
+        return error
+
+    try:
+        job_queue.admit(_job_type(initial_state['file']))
+    except JobQueueFull as e:
+        logger.warning(f"Rejected chat request: {e}")
+        return {"status": 503,
+                "response": str(e),
+                "output_message": "Server is busy, please try again later"
+                }
+
+    return StreamingResponse(
+        _stream_chat(initial_state, config),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/jobs/stats/")
+async def jobs_stats():
+    """Concurrency, queue depth and running jobs per job type"""
+    return job_queue.stats()
+
+
+@app.get("/jobs/{job_id}/")
+async def job_status(job_id: str):
+    """Status and, once finished, result of a queued chat job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return {"status": 404, "response": "Job not found"}
+    return job
 
 
 @app.post("/state/")
@@ -130,11 +327,8 @@ async def chat(user_id: str):
     thread_id = get_or_create_thread_id(user_id)
     config = {"configurable": {"thread_id": "2022_2025-09-13"}}
 
-    # Use the context manager to get the actual saver
-    async with AsyncPostgresSaver.from_conn_string(settings.PG_DATABASE_URL) as saver:
-        # Build graph with that saver
-        graph = await build_graph(checkpointer=saver)
-        response = await graph.aget_state(config)
+    graph = await graph_manager.get_graph("whatsapp")
+    response = await graph.aget_state(config)
 
     # # seach vector db
     # vector_response = await qdrant_manager.search(
@@ -144,3 +338,36 @@ async def chat(user_id: str):
     # )
 
     return {"response": response}
+
+
+@app.get("/embeddings/stats/")
+async def embeddings_stats():
+    """Batch size, queue depth and wait-time metrics of the embedding batchers"""
+    return {
+        "batchers": [b.stats() for b in (text_batcher, image_batcher, rag_batcher)],
+        "query_cache": query_cache.stats(),
+    }
+
+
+@app.get("/models/stats/")
+async def models_stats():
+    """Load state, load time and memory of registry models"""
+    return model_registry.stats()
+
+
+@app.get("/answer-cache/stats/")
+async def answer_cache_stats():
+    """Hit ratio and latency saved by the semantic answer cache"""
+    return answer_cache.stats()
+
+
+@app.get("/transcription/stats/")
+async def transcription_stats():
+    """Requests, retries, failures and latency of the transcription client"""
+    return transcriber.stats()
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus histograms of request, node and operation latency"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,232 @@
+import asyncio
+import datetime
+import time
+from typing import Optional, List, Dict, Any
+
+from src.core.settings import settings
+from src.utils.db import checkpoint_db
+from src.utils.graph_registry import graph_manager
+from src.utils.qdrant_db import qdrant_manager
+from src.utils.helpers import list_threads_for_date
+
+from src.core.logging_config import get_logger
+logger = get_logger(__name__)
+
+
+WATERMARK_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS archive_watermarks (
+        archive_date VARCHAR(10) PRIMARY KEY,
+        last_thread_id VARCHAR(255) NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """
+
+_DONE = object()
+
+
+class ThreadArchiver:
+    """
+    Archive a day's checkpointed threads to Qdrant as a bounded-concurrency pipeline.
+    - Stage 1: `fetch_concurrency` workers load thread states from the checkpointer.
+    - Stage 2: fetched threads are grouped by `batch_threads` and embedded/upserted together.
+    - Thread ids are processed in sorted order; the watermark is the last id below which
+      every thread is archived, persisted after each batch so a crash resumes from there.
+    - Failures are isolated per thread/batch and keep the watermark from moving past them.
+    - A date's watermark row exists from the start of its run (or, for the next day,
+      from the previous run) until it finishes without failures, so leftover rows of
+      past days are the dates to resume after a crash or a missed night (`run_pending`).
+    """
+
+    def __init__(self, **kwargs):
+        self.fetch_concurrency = kwargs.get('fetch_concurrency', 8)
+        self.batch_threads = kwargs.get('batch_threads', 16)
+        self.graph_name = kwargs.get('graph_name', "whatsapp")
+
+    # ------------------ WATERMARK ------------------
+    async def _load_watermark(self, date: str) -> Optional[str]:
+        async with checkpoint_db.get_connection() as conn:
+            await conn.execute(WATERMARK_TABLE_QUERY)
+            return await conn.fetchval(
+                "SELECT last_thread_id FROM archive_watermarks WHERE archive_date = $1",
+                date
+            )
+
+    async def _claim_watermark(self, date: str):
+        """Mark `date` as in progress ("" sorts before every thread id)"""
+        async with checkpoint_db.get_connection() as conn:
+            await conn.execute(WATERMARK_TABLE_QUERY)
+            await conn.execute(
+                """
+                INSERT INTO archive_watermarks (archive_date, last_thread_id, updated_at)
+                VALUES ($1, '', NOW())
+                ON CONFLICT (archive_date) DO NOTHING
+                """,
+                date
+            )
+
+    async def _delete_watermark(self, date: str):
+        async with checkpoint_db.get_connection() as conn:
+            await conn.execute("DELETE FROM archive_watermarks WHERE archive_date = $1", date)
+
+    async def incomplete_dates(self) -> List[str]:
+        """Past dates that are claimed but not archived cleanly yet"""
+        today = datetime.date.today().strftime("%Y-%m-%d")
+        async with checkpoint_db.get_connection() as conn:
+            await conn.execute(WATERMARK_TABLE_QUERY)
+            rows = await conn.fetch(
+                "SELECT archive_date FROM archive_watermarks WHERE archive_date < $1 ORDER BY archive_date",
+                today
+            )
+        return [row["archive_date"] for row in rows]
+
+    async def _save_watermark(self, date: str, thread_id: str):
+        async with checkpoint_db.get_connection() as conn:
+            await conn.execute(
+                """
+                INSERT INTO archive_watermarks (archive_date, last_thread_id, updated_at)
+                VALUES ($1, $2, NOW())
+                ON CONFLICT (archive_date)
+                DO UPDATE SET last_thread_id = EXCLUDED.last_thread_id, updated_at = NOW()
+                """,
+                date,
+                thread_id
+            )
+
+    # ------------------ PIPELINE ------------------
+    async def _fetch_stage(self, graph, ids: asyncio.Queue, out: asyncio.Queue, failed: set):
+        """Load thread states until the id queue is drained"""
+        while True:
+            try:
+                thread_id = ids.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                state = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+                messages = state[0].get("messages", [])
+                await out.put({
+                    "user_id": thread_id.split("_")[0],  # since format = <user_id>_<date>
+                    "thread_id": thread_id,
+                    "messages": messages,
+                })
+            except Exception as e:
+                logger.error(f"Failed to fetch state for thread={thread_id}: {e}")
+                failed.add(thread_id)
+
+    async def _save_batch(self, batch: List[Dict[str, Any]], done: set, failed: set) -> int:
+        """Embed and upsert one batch of threads, returns number of saved messages"""
+        thread_ids = [thread["thread_id"] for thread in batch]
+        try:
+            saved = await qdrant_manager.save_threads([t for t in batch if t["messages"]])
+            done.update(thread_ids)
+            return saved
+        except Exception as e:
+            logger.error(f"Failed to archive threads {thread_ids}: {e}")
+            failed.update(thread_ids)
+            return 0
+
+    async def run(self, date: str) -> Dict[str, Any]:
+        """Archive all threads of `date`, resuming after the persisted watermark"""
+        start_time = time.perf_counter()
+
+        thread_ids = sorted(await list_threads_for_date(date) or [])
+        watermark = await self._load_watermark(date)
+        if watermark is None:
+            await self._claim_watermark(date)
+        pending = [t for t in thread_ids if watermark is None or t > watermark]
+        if watermark:
+            logger.info(f"Resuming archive for {date} after thread={watermark}, {len(pending)} threads left")
+
+        graph = await graph_manager.get_graph(self.graph_name)
+
+        ids: asyncio.Queue = asyncio.Queue()
+        for thread_id in pending:
+            ids.put_nowait(thread_id)
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=self.batch_threads * 2)
+
+        done: set = set()
+        failed: set = set()
+        position = 0
+        messages_saved = 0
+
+        async def _fetchers():
+            await asyncio.gather(*(
+                self._fetch_stage(graph, ids, fetched, failed)
+                for _ in range(self.fetch_concurrency)
+            ))
+            await fetched.put(_DONE)
+
+        fetch_task = asyncio.create_task(_fetchers())
+        try:
+            finished = False
+            while not finished:
+                item = await fetched.get()
+                if item is _DONE:
+                    break
+                batch = [item]
+                while len(batch) < self.batch_threads and not fetched.empty():
+                    item = fetched.get_nowait()
+                    if item is _DONE:
+                        finished = True
+                        break
+                    batch.append(item)
+
+                messages_saved += await self._save_batch(batch, done, failed)
+
+                # Advance watermark over the contiguous prefix of archived threads
+                new_position = position
+                while new_position < len(pending) and pending[new_position] in done:
+                    new_position += 1
+                if new_position > position:
+                    position = new_position
+                    await self._save_watermark(date, pending[position - 1])
+        finally:
+            if not fetch_task.done():
+                fetch_task.cancel()
+            await asyncio.gather(fetch_task, return_exceptions=True)
+
+        # Finished cleanly: nothing to resume for this date
+        if not failed and position == len(pending):
+            await self._delete_watermark(date)
+
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            "date": date,
+            "threads_total": len(thread_ids),
+            "threads_archived": len(done),
+            "threads_failed": len(failed),
+            "messages_saved": messages_saved,
+            "seconds": round(elapsed, 3),
+            "threads_per_sec": round(len(done) / elapsed, 2) if elapsed else 0.0,
+            "messages_per_sec": round(messages_saved / elapsed, 2) if elapsed else 0.0,
+        }
+        logger.info(f"Archive run finished: {stats}")
+        return stats
+
+    async def run_pending(self, date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Resume every incomplete past date, then archive `date`"""
+        dates = await self.incomplete_dates()
+        if dates:
+            logger.info(f"Resuming incomplete archive dates: {dates}")
+        if date is not None and date not in dates:
+            dates.append(date)
+
+        results = []
+        for pending_date in dates:
+            try:
+                results.append(await self.run(pending_date))
+            except Exception as e:
+                logger.error(f"Archive run for {pending_date} failed: {e}")
+
+        if date is not None:
+            # Claim the next day now: if its nightly run is missed, the row is still
+            # there on the next run or restart and the day gets archived then
+            next_date = datetime.date.fromisoformat(date) + datetime.timedelta(days=1)
+            await self._claim_watermark(next_date.strftime("%Y-%m-%d"))
+        return results
+
+
+# Singleton archiver
+thread_archiver = ThreadArchiver(
+    fetch_concurrency=settings.ARCHIVE_FETCH_CONCURRENCY,
+    batch_threads=settings.ARCHIVE_BATCH_THREADS,
+)
@@ -1,58 +1,38 @@
 import datetime
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
-from src.agents.whatsapp.graph import build_graph
-from src.core.settings import settings
-from src.utils.qdrant_db import qdrant_manager
-from src.core.embeddings import embed_text
+from src.schedular.archiver import thread_archiver
 from src.core.logging_config import get_logger
 
-from src.utils.helpers import (
-    list_threads_for_date
-)
-
 logger = get_logger(__name__)
 
 scheduler = AsyncIOScheduler()
 
 
 async def flush_yesterday_threads():
-    """Fetch all yesterday's threads from LangGraph checkpointer and archive to Qdrant"""
+    """Fetch all yesterday's threads from LangGraph checkpointer and archive to Qdrant,
+    after resuming any earlier date whose run crashed or did not finish"""
     yesterday = (datetime.date.today() - datetime.timedelta(days=1)).strftime("%Y-%m-%d")
 
     try:
-        async with AsyncPostgresSaver.from_conn_string(settings.PG_DATABASE_URL) as saver:
-            # TODO: Implement actual listing of thread_ids from saver storage
-            thread_ids = await list_threads_for_date(yesterday)
-
-            # Build graph with that saver
-            graph = await build_graph(checkpointer=saver)
-
-            for thread_id in thread_ids:
-
-                config={"configurable": {"thread_id": thread_id}}
-
-                state = await graph.aget_state(config)
-
-                messages = state[0].get("messages", [])
+        for stats in await thread_archiver.run_pending(yesterday):
+            logger.info(
+                f"Flushed {stats['threads_archived']}/{stats['threads_total']} threads "
+                f"({stats['messages_saved']} messages) for {stats['date']} to Qdrant: "
+                f"{stats['threads_per_sec']} threads/s, {stats['messages_per_sec']} messages/s"
+            )
 
-                if not messages:
-                    continue
-
-                user_id = thread_id.split("_")[0]  # since format = <user_id>_<date>
-
-                # Save all messages to Qdrant
-                await qdrant_manager.save_messages(
-                    user_id=user_id,
-                    thread_id=thread_id,
-                    messages=messages,
-                )
+    except Exception as e:
+        logger.error(f"Error while flushing yesterday's threads: {e}")
 
-                logger.info(f"Flushed {len(messages)} messages for thread={thread_id} to Qdrant")
 
+async def resume_incomplete_archives():
+    """On startup, finish archive dates left incomplete by a crash or restart"""
+    try:
+        for stats in await thread_archiver.run_pending():
+            logger.info(f"Resumed archive for {stats['date']}: {stats['threads_archived']}/{stats['threads_total']} threads")
     except Exception as e:
-        logger.error(f"Error while flushing yesterday's threads: {e}")
+        logger.error(f"Error while resuming incomplete archives: {e}")
 
 
 def start_scheduler():
@@ -63,5 +43,7 @@ def start_scheduler():
         minute=46,
         misfire_grace_time=3600,  # 1 hour grace period
         )
+    # One-off run at startup for dates a crashed run left behind
+    scheduler.add_job(resume_incomplete_archives, "date")
     scheduler.start()
     logger.info("Scheduler started - flushing job set for 09:10 daily")
@@ -1,37 +1,118 @@
 import os
 import uuid
+import asyncio
+import hashlib
 import aiofiles
 import aiohttp
+from typing import Optional
 from urllib.parse import urlparse
 
 from src.core.settings import settings
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
 
-async def save_file(url: str, folder: str = settings.DATA_DIR) -> dict:
+
+class FileTooLargeError(ValueError):
+    """Raised when a download exceeds the configured size limit"""
+
+
+class AsyncHTTPManager:
+    """Shared aiohttp session with a pooled connector, created once in lifespan"""
+
+    def __init__(self, **kwargs):
+        self.limit = kwargs.get('limit', 100)
+        self.timeout = kwargs.get('timeout', 60)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+
+    async def connect(self):
+        """Create the pooled client session"""
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=self.limit, ttl_dns_cache=300),
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                )
+                logger.info("HTTP client session created")
+
+    async def close(self):
+        """Close the client session and its connections"""
+        async with self._lock:
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+                logger.info("HTTP client session closed")
+
+    @property
+    def is_connected(self) -> bool:
+        return self._session is not None and not self._session.closed
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if not self.is_connected:
+            await self.connect()
+        return self._session
+
+
+# Singleton manager
+http_manager = AsyncHTTPManager(
+    limit=settings.HTTP_POOL_LIMIT,
+    timeout=settings.HTTP_TIMEOUT_SECONDS,
+)
+
+
+async def save_file(url: str, folder: str = settings.DATA_DIR, max_bytes: int = settings.MAX_DOWNLOAD_BYTES) -> dict:
     """
-    Download a file from a URL and save it locally with a unique name.
-    Returns the local file path.
+    Download a file from a URL and save it locally under its content hash.
+    - Streams to a temporary file while computing sha256, aborting past `max_bytes`.
+    - Identical media is stored once: an existing `<sha256><ext>` file is reused.
+    Returns the local file path, content hash, size and whether it was deduplicated.
     """
     logger.info(f"Downloading file: {url} to folder: {folder}")
 
     os.makedirs(folder, exist_ok=True)
 
-    # Extract path part
+    # Keep the extension, routing and extractors depend on it
     path = urlparse(url).path
-    # Get filename
-    filename = os.path.basename(path)
+    _, ext = os.path.splitext(os.path.basename(path))
+    ext = ext.lower()
 
-    # Join path
-    file_path = os.path.join(folder, filename)
+    tmp_path = os.path.join(folder, f".{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
 
-    # Download and save asynchronously
-    async with aiohttp.ClientSession() as session:
+    session = await http_manager.get_session()
+    try:
         async with session.get(url) as response:
             response.raise_for_status()
-            async with aiofiles.open(file_path, "wb") as out_file:
+            if response.content_length and response.content_length > max_bytes:
+                raise FileTooLargeError(f"File is {response.content_length} bytes, limit is {max_bytes}")
+
+            async with aiofiles.open(tmp_path, "wb") as out_file:
                 async for chunk in response.content.iter_chunked(1024 * 1024):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise FileTooLargeError(f"File exceeds the {max_bytes} bytes limit")
+                    digest.update(chunk)
                     await out_file.write(chunk)
 
-    logger.info(f"File saved to: {file_path}")
-    return {"file_path": file_path}
+        file_hash = digest.hexdigest()
+        file_path = os.path.join(folder, f"{file_hash}{ext}")
+
+        deduplicated = os.path.exists(file_path)
+        if deduplicated:
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, file_path)
+
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    logger.info(f"File saved to: {file_path} ({size} bytes, deduplicated={deduplicated})")
+    return {
+        "file_path": file_path,
+        "file_hash": file_hash,
+        "size": size,
+        "deduplicated": deduplicated,
+    }
@@ -0,0 +1,180 @@
+import asyncio
+from typing import Optional, Dict, Callable, Awaitable, Any
+
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+from src.core.settings import settings
+from src.core.metrics import timer
+from src.core.logging_config import get_logger
+logger = get_logger(__name__)
+
+
+async def _build_whatsapp_graph(checkpointer):
+    from src.agents.whatsapp.graph import build_graph
+    return await build_graph(checkpointer=checkpointer)
+
+
+async def _build_whatsapp_rag_graph(checkpointer):
+    from src.agents.whatsapp_rag.graph import build_graph
+    return await build_graph(checkpointer=checkpointer)
+
+
+class _TimedCheckpointer:
+    """Mixin recording checkpoint read/write latency"""
+
+    async def aget_tuple(self, *args, **kwargs):
+        with timer("checkpointer.get"):
+            return await super().aget_tuple(*args, **kwargs)
+
+    async def aput(self, *args, **kwargs):
+        with timer("checkpointer.put"):
+            return await super().aput(*args, **kwargs)
+
+    async def aput_writes(self, *args, **kwargs):
+        with timer("checkpointer.put_writes"):
+            return await super().aput_writes(*args, **kwargs)
+
+
+class TimedPostgresSaver(_TimedCheckpointer, AsyncPostgresSaver):
+    """AsyncPostgresSaver recording checkpoint read/write latency"""
+
+
+class AsyncGraphManager:
+    """
+    Process-wide registry of compiled LangGraph graphs sharing one checkpointer.
+    - backend "postgres": AsyncPostgresSaver on a psycopg connection pool.
+    - backend "sqlite": AsyncSqliteSaver on a local file (load tests, local runs).
+    """
+
+    def __init__(self, **kwargs):
+        self.dsn = kwargs.get('dsn')
+        self.backend = kwargs.get('backend', "postgres")
+        self.sqlite_path = kwargs.get('sqlite_path', "checkpoints.sqlite")
+        self.pool_kwargs = {
+            'min_size': kwargs.get('min_size', 1),
+            'max_size': kwargs.get('max_size', 10),
+        }
+        # Registry of graph builders: name -> async builder(checkpointer)
+        self.builders: Dict[str, Callable[[Any], Awaitable[Any]]] = kwargs.get('builders', {})
+
+        self._pool: Optional[AsyncConnectionPool] = None
+        self._sqlite_conn = None
+        self._saver = None
+        self._graphs: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+
+    async def _connect_postgres(self):
+        try:
+            self._pool = AsyncConnectionPool(
+                conninfo=self.dsn,
+                open=False,
+                kwargs={
+                    "autocommit": True,
+                    "prepare_threshold": 0,
+                    "row_factory": dict_row,
+                },
+                **self.pool_kwargs
+            )
+            await self._pool.open(wait=True)
+
+            self._saver = TimedPostgresSaver(self._pool)
+            await self._saver.setup()
+            logger.info("Checkpointer connection pool created")
+
+        except Exception as e:
+            logger.error(f"Failed to create checkpointer pool: {e}")
+            if self._pool is not None:
+                await self._pool.close()
+            self._pool = None
+            self._saver = None
+            raise
+
+    async def _connect_sqlite(self):
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        class TimedSqliteSaver(_TimedCheckpointer, AsyncSqliteSaver):
+            """AsyncSqliteSaver recording checkpoint read/write latency"""
+
+        self._sqlite_conn = await aiosqlite.connect(self.sqlite_path)
+        self._saver = TimedSqliteSaver(self._sqlite_conn)
+        await self._saver.setup()
+        logger.info(f"SQLite checkpointer opened at {self.sqlite_path}")
+
+    async def connect(self):
+        """Open the checkpointer connection(s) and create checkpoint tables once"""
+        async with self._lock:
+            if self._saver is None:
+                if self.backend == "sqlite":
+                    await self._connect_sqlite()
+                else:
+                    await self._connect_postgres()
+
+    async def close(self):
+        """Close checkpointer connections and drop compiled graphs"""
+        async with self._lock:
+            try:
+                if self._pool:
+                    logger.info("Closing checkpointer connection pool...")
+                    await self._pool.close()
+                    logger.info("Checkpointer connection pool closed successfully")
+                if self._sqlite_conn is not None:
+                    await self._sqlite_conn.close()
+            except Exception as e:
+                logger.error(f"Error closing checkpointer: {e}")
+            finally:
+                self._pool = None
+                self._sqlite_conn = None
+                self._saver = None
+                self._graphs.clear()
+
+    @property
+    def is_connected(self) -> bool:
+        if self.backend == "sqlite":
+            return self._saver is not None
+        return self._pool is not None and not self._pool.closed
+
+    @property
+    def checkpointer(self):
+        if self._saver is None:
+            raise RuntimeError("Checkpointer is not initialized, call connect() first")
+        return self._saver
+
+    async def get_graph(self, name: str):
+        """Return compiled graph by name, compiling it on first use"""
+        graph = self._graphs.get(name)
+        if graph is not None:
+            return graph
+
+        if not self.is_connected:
+            await self.connect()
+
+        if name not in self.builders:
+            raise KeyError(f"Unknown graph: {name}")
+
+        async with self._lock:
+            if name not in self._graphs:
+                self._graphs[name] = await self.builders[name](self._saver)
+                logger.info(f"Graph '{name}' compiled")
+            return self._graphs[name]
+
+    async def warm_up(self):
+        """Compile all registered graphs"""
+        for name in self.builders:
+            await self.get_graph(name)
+
+
+# Singleton manager
+graph_manager = AsyncGraphManager(
+    dsn=settings.PG_DATABASE_URL,
+    backend=settings.CHECKPOINTER_BACKEND,
+    sqlite_path=settings.CHECKPOINTER_SQLITE_PATH,
+    min_size=settings.PG_POOL_MIN_SIZE,
+    max_size=settings.PG_POOL_MAX_SIZE,
+    builders={
+        "whatsapp": _build_whatsapp_graph,
+        "whatsapp_rag": _build_whatsapp_rag_graph,
+    }
+)
@@ -1,8 +1,10 @@
+import httpx
 from datetime import datetime
-from typing import List, Union
+from typing import List, Union, Optional, Sequence, Dict, Tuple, Any
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
-from sentence_transformers import SentenceTransformer
+from langchain_core.tools import BaseTool
+from langgraph.prebuilt import create_react_agent
 
 from src.utils.db import checkpoint_db
 from src.core.settings import settings
@@ -18,13 +20,64 @@ def get_or_create_thread_id(phone_number: str) -> str:
     """
     return f"{phone_number}_{datetime.now().strftime('%Y-%m-%d')}"
 
-def get_chat_model() -> ChatGroq:
-    """Return a ChatGroq model instance."""
-    return ChatGroq(
-        api_key=settings.GROQ_API_KEY,
-        model=settings.OPENAI_GPT_120,
-        temperature=settings.TEMPERATURE,
-    )
+# Process-wide LLM clients: one HTTP pool shared by every ChatGroq, models and
+# agents cached by (model, temperature[, tools]) so no turn pays for a new
+# client, TLS handshake or agent graph compilation.
+_http_clients: Dict[str, Any] = {}
+_chat_models: Dict[Tuple[str, float], ChatGroq] = {}
+_react_agents: Dict[Tuple, Any] = {}
+
+
+def _get_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    if not _http_clients:
+        limits = httpx.Limits(
+            max_connections=settings.LLM_HTTP_POOL_LIMIT,
+            max_keepalive_connections=settings.LLM_HTTP_POOL_LIMIT,
+        )
+        _http_clients["sync"] = httpx.Client(limits=limits)
+        _http_clients["async"] = httpx.AsyncClient(limits=limits)
+    return _http_clients["sync"], _http_clients["async"]
+
+
+def get_chat_model(model: Optional[str] = None, temperature: Optional[float] = None) -> ChatGroq:
+    """Return the shared ChatGroq instance for (model, temperature)."""
+    key = (model or settings.OPENAI_GPT_120, settings.TEMPERATURE if temperature is None else temperature)
+    chat_model = _chat_models.get(key)
+    if chat_model is None:
+        http_client, http_async_client = _get_http_clients()
+        chat_model = ChatGroq(
+            api_key=settings.GROQ_API_KEY,
+            model=key[0],
+            temperature=key[1],
+            http_client=http_client,
+            http_async_client=http_async_client,
+        )
+        _chat_models[key] = chat_model
+    return chat_model
+
+
+def get_react_agent(tools: Sequence[BaseTool], model: Optional[str] = None, temperature: Optional[float] = None):
+    """
+    Return the shared ReAct agent for (model, temperature, tools).
+    Tools must not close over per-request data; pass it through the run
+    config instead (see whatsapp.tools.vector_search).
+    """
+    chat_model = get_chat_model(model, temperature)
+    key = (chat_model.model_name, chat_model.temperature, tuple((t.name, id(t)) for t in tools))
+    agent = _react_agents.get(key)
+    if agent is None:
+        agent = create_react_agent(chat_model, tools=list(tools))
+        _react_agents[key] = agent
+    return agent
+
+
+async def close_chat_clients():
+    """Close the shared LLM HTTP pool (application shutdown)"""
+    if _http_clients:
+        _http_clients.pop("sync").close()
+        await _http_clients.pop("async").aclose()
+    _chat_models.clear()
+    _react_agents.clear()
 
 async def log_conversation(conn, thread_id: str, user_id: str, messages: List[BaseMessage]):
     """Log conversation messages to database with better error handling"""
@@ -0,0 +1,214 @@
+import asyncio
+import contextvars
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, Awaitable
+
+from src.core.settings import settings
+from src.utils.file_handler import http_manager
+from src.core.logging_config import get_logger
+logger = get_logger(__name__)
+
+
+class JobQueueFull(Exception):
+    """Raised when a job type's queue is at its maximum depth"""
+
+
+class AsyncJobQueue:
+    """
+    In-process job queue with one bounded queue and worker pool per job type.
+    - `concurrency` workers per type run jobs; blocking functions run on the
+      type's own thread pool instead of the event loop's default executor.
+    - `max_queue` bounds waiting jobs: `submit`/`admit` shed load past it,
+      `run` applies backpressure (waits for room).
+    - Jobs run in the submitter's context, so context variables (e.g. the
+      retrieved source ids, LangChain run config) carry over to the worker.
+    - Jobs from `submit` are kept for `result_ttl` seconds after finishing for
+      polling; `run`/`run_sync` jobs are transient and only resolve their future.
+    """
+
+    def __init__(self, pools: Dict[str, Dict[str, int]], result_ttl: float = 3600):
+        self.pools_config = pools
+        self.result_ttl = result_ttl
+
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._workers: list = []
+        self._jobs: Dict[str, Dict[str, Any]] = {}  # submitted jobs only
+        self._running: Dict[str, int] = {job_type: 0 for job_type in pools}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ------------------ LIFECYCLE ------------------
+    async def start(self):
+        """Create queues and worker tasks on the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+        self._loop = loop
+        for job_type, cfg in self.pools_config.items():
+            self._queues[job_type] = asyncio.Queue(maxsize=cfg["max_queue"])
+            if job_type not in self._executors:
+                self._executors[job_type] = ThreadPoolExecutor(
+                    max_workers=cfg["concurrency"],
+                    thread_name_prefix=f"job-{job_type}"
+                )
+            for i in range(cfg["concurrency"]):
+                self._workers.append(loop.create_task(self._worker(job_type), name=f"job-{job_type}-{i}"))
+        logger.info(f"Job queue started: { {t: c['concurrency'] for t, c in self.pools_config.items()} }")
+
+    async def stop(self):
+        """Cancel workers and fail queued jobs"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for queue in self._queues.values():
+            while not queue.empty():
+                job = queue.get_nowait()
+                self._finish(job, error="Job queue stopped")
+        logger.info("Job queue stopped")
+
+    # ------------------ WORKERS ------------------
+    async def _worker(self, job_type: str):
+        queue = self._queues[job_type]
+        while True:
+            job = await queue.get()
+            job["status"] = "running"
+            job["started_at"] = time.time()
+            self._running[job_type] += 1
+            try:
+                result = await asyncio.get_running_loop().create_task(job["fn"](), context=job["context"])
+                self._finish(job, result=result)
+            except BaseException as e:
+                # A job raising CancelledError must not take the worker down with it
+                if not isinstance(e, Exception):
+                    e = RuntimeError(f"Job cancelled ({type(e).__name__})")
+                logger.error(f"Job {job['id']} ({job_type}) failed: {e}")
+                self._finish(job, error=str(e), exception=e)
+                if asyncio.current_task().cancelling():
+                    raise
+            finally:
+                self._running[job_type] -= 1
+                if job["status"] == "running":  # always resolve the waiting future
+                    self._finish(job, error="Job did not complete")
+
+            if job.get("webhook_url"):
+                await self._notify(job)
+
+    def _finish(self, job: Dict[str, Any], result: Any = None, error: Optional[str] = None, exception: Optional[Exception] = None):
+        job["finished_at"] = time.time()
+        job["status"] = "failed" if error else "done"
+        job["result"] = result
+        job["error"] = error
+        future = job.pop("future", None)
+        if future is not None and not future.done():
+            if exception is not None or error:
+                future.set_exception(exception or RuntimeError(error))
+            else:
+                future.set_result(result)
+        job.pop("fn", None)
+        job.pop("context", None)
+
+    async def _notify(self, job: Dict[str, Any]):
+        """POST the finished job to its webhook"""
+        try:
+            session = await http_manager.get_session()
+            async with session.post(job["webhook_url"], json=self.get(job["id"])) as response:
+                response.raise_for_status()
+        except Exception as e:
+            logger.error(f"Webhook for job {job['id']} failed: {e}")
+
+    # ------------------ SUBMIT ------------------
+    def _new_job(self, job_type: str, fn: Callable[[], Awaitable[Any]], webhook_url: Optional[str] = None, register: bool = True) -> Dict[str, Any]:
+        if job_type not in self.pools_config:
+            raise KeyError(f"Unknown job type: {job_type}")
+        job = {
+            "id": uuid.uuid4().hex,
+            "type": job_type,
+            "status": "queued",
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "webhook_url": webhook_url,
+            "fn": fn,
+            "context": contextvars.copy_context(),
+        }
+        if register:
+            # Only pollable jobs are kept; internal run() calls would pin their results
+            self._purge()
+            self._jobs[job["id"]] = job
+        return job
+
+    def admit(self, job_type: str):
+        """Raise JobQueueFull if `job_type` is already at its queue depth"""
+        queue = self._queues.get(job_type)
+        if queue is not None and queue.full():
+            raise JobQueueFull(f"'{job_type}' queue is full ({queue.qsize()} waiting)")
+
+    async def submit(self, job_type: str, fn: Callable[[], Awaitable[Any]], webhook_url: Optional[str] = None) -> str:
+        """Enqueue a job and return its id without waiting; raises JobQueueFull when full"""
+        await self.start()
+        self.admit(job_type)
+        job = self._new_job(job_type, fn, webhook_url)
+        self._queues[job_type].put_nowait(job)
+        return job["id"]
+
+    async def run(self, job_type: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a job in the `job_type` pool and wait for its result"""
+        await self.start()
+        job = self._new_job(job_type, fn, register=False)
+        job["future"] = asyncio.get_running_loop().create_future()
+        future = job["future"]
+        await self._queues[job_type].put(job)
+        return await future
+
+    async def run_sync(self, job_type: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking function on the `job_type` thread pool, bounded by its concurrency"""
+        loop = asyncio.get_running_loop()
+
+        async def _call():
+            return await loop.run_in_executor(self._executors[job_type], lambda: fn(*args, **kwargs))
+
+        return await self.run(job_type, _call)
+
+    # ------------------ STATUS ------------------
+    def _purge(self):
+        """Forget finished jobs older than result_ttl"""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        return {
+            key: value for key, value in job.items()
+            if key not in ("fn", "context", "future", "webhook_url")
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            job_type: {
+                "concurrency": cfg["concurrency"],
+                "max_queue": cfg["max_queue"],
+                "queued": self._queues[job_type].qsize() if job_type in self._queues else 0,
+                "running": self._running.get(job_type, 0),
+            }
+            for job_type, cfg in self.pools_config.items()
+        }
+
+
+# Singleton queue
+job_queue = AsyncJobQueue(
+    pools=settings.JOB_POOLS,
+    result_ttl=settings.JOB_RESULT_TTL_SECONDS,
+)
@@ -5,6 +5,7 @@ import aioodbc
 from urllib.parse import urlparse
 
 from src.core.settings import settings
+from src.core.metrics import timed
 from src.core.logging_config import get_logger
 logger = get_logger(__name__)
 
@@ -101,6 +102,7 @@ class AsyncMSSQLManager:
                 await cur.execute(query, args)
                 return cur.rowcount
 
+    @timed("client_db.fetch_all")
     async def fetch_all(self, query: str, *args):
         """Fetch all rows"""
         async with self.get_connection() as conn:
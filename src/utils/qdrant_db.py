@@ -2,16 +2,37 @@ import asyncio
 from datetime import datetime
 from contextlib import asynccontextmanager
 from typing import Optional, List, Dict, Any
-from uuid import uuid4
+from uuid import uuid4, uuid5, NAMESPACE_URL
 from langchain_core.messages import HumanMessage, AIMessage
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.http.models import PointStruct, Filter, FieldCondition, MatchValue, VectorParams
 
 from src.core.settings import settings
+from src.core.metrics import timed
 from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+
+async def upsert_in_batches(client: AsyncQdrantClient, points: List[PointStruct], collection_name: str, wait: bool = True):
+    """Upsert points in QDRANT_UPSERT_BATCH_SIZE chunks, up to QDRANT_UPSERT_CONCURRENCY requests in flight.
+
+    wait=True returns once the points are searchable; callers that never read
+    their writes back immediately pass wait=False to skip the indexing wait.
+    """
+    batch_size = settings.QDRANT_UPSERT_BATCH_SIZE
+    semaphore = asyncio.Semaphore(settings.QDRANT_UPSERT_CONCURRENCY)
+
+    async def _upsert(chunk: List[PointStruct]):
+        async with semaphore:
+            await client.upsert(collection_name=collection_name, points=chunk, wait=wait)
+
+    await asyncio.gather(*(
+        _upsert(points[i:i + batch_size])
+        for i in range(0, len(points), batch_size)
+    ))
+
+
 class AsyncQdrantManager:
     """Async Qdrant manager with structured pool-like behavior"""
     def __init__(self, **kwargs):
@@ -66,15 +87,10 @@ class AsyncQdrantManager:
             logger.info(f"Collection '{collection_name}' created")
 
     # ------------------ SAVE ------------------
-    async def save_messages(self, user_id: str, thread_id: str, messages, collection_name="whatsapp_agent"):
-        """Save human/AI conversation"""
-        if not self.is_connected:
-            await self.connect()
-
-        cfg = self.collections_config[collection_name]
-        embed_fn = cfg["embed_fn"]
-        points = []
-        for msg in messages:
+    def _message_records(self, user_id: str, thread_id: str, messages) -> List[Dict[str, Any]]:
+        """Convert human/AI messages to point records (id + payload), skipping empty/unknown ones"""
+        records = []
+        for index, msg in enumerate(messages):
             if isinstance(msg, HumanMessage):
                 role = "user"
                 content = msg.content
@@ -86,24 +102,74 @@ class AsyncQdrantManager:
                 continue
             if not content:
                 continue
-            vector = await embed_fn(content)
-            points.append(
-                PointStruct(
-                    id=str(uuid4()),
-                    vector=vector,
-                    payload={
-                        "user_id": user_id,
-                        "thread_id": thread_id,
-                        "role": role,
-                        "content": content,
-                        "timestamp": datetime.now(),
-                    }
-                )
+            # Deterministic id so re-archiving a thread overwrites instead of duplicating
+            point_id = str(uuid5(NAMESPACE_URL, f"{thread_id}:{getattr(msg, 'id', None) or index}"))
+            records.append({
+                "id": point_id,
+                "user_id": user_id,
+                "thread_id": thread_id,
+                "role": role,
+                "content": content,
+                "timestamp": datetime.now(),
+            })
+        return records
+
+    async def _embed_contents(self, cfg: Dict[str, Any], contents: List[str]) -> List[List[float]]:
+        """Embed all contents in one batched call when the collection supports it"""
+        embed_batch_fn = cfg.get("embed_batch_fn")
+        if embed_batch_fn is not None:
+            return await embed_batch_fn(contents)
+        return list(await asyncio.gather(*(cfg["embed_fn"](content) for content in contents)))
+
+    async def upsert_points(self, points: List[PointStruct], collection_name: str, wait: bool = True):
+        """Upsert points in size-bounded, pipelined chunks (see upsert_in_batches)"""
+        if not self.is_connected:
+            await self.connect()
+        await upsert_in_batches(self._client, points, collection_name, wait=wait)
+
+    async def save_threads(self, threads: List[Dict[str, Any]], collection_name="whatsapp_agent") -> int:
+        """
+        Save many conversations at once.
+        - threads: list of {"user_id", "thread_id", "messages"}
+        - All message contents are embedded in one batch, then upserted in chunks.
+        Returns number of saved points.
+        """
+        if not self.is_connected:
+            await self.connect()
+
+        cfg = self.collections_config[collection_name]
+
+        records = []
+        for thread in threads:
+            records.extend(self._message_records(thread["user_id"], thread["thread_id"], thread["messages"]))
+        if not records:
+            return 0
+
+        vectors = await self._embed_contents(cfg, [record["content"] for record in records])
+        points = [
+            PointStruct(
+                id=record["id"],
+                vector=vector,
+                payload={key: value for key, value in record.items() if key != "id"}
             )
+            for record, vector in zip(records, vectors)
+        ]
+
+        # No wait: archived/saved messages are not searched right after the write,
+        # and deterministic ids make a retried batch overwrite instead of duplicate
+        await self.upsert_points(points, collection_name=collection_name, wait=False)
+        logger.info(f"Saved {len(points)} messages for {len(threads)} threads")
+        return len(points)
 
-        if points:
-            await self._client.upsert(collection_name=collection_name, points=points)
-            logger.info(f"Saved {len(points)} messages for user={user_id}, thread={thread_id}")
+    async def save_messages(self, user_id: str, thread_id: str, messages, collection_name="whatsapp_agent"):
+        """Save human/AI conversation"""
+        saved = await self.save_threads(
+            [{"user_id": user_id, "thread_id": thread_id, "messages": messages}],
+            collection_name=collection_name,
+        )
+        if saved:
+            logger.info(f"Saved {saved} messages for user={user_id}, thread={thread_id}")
+        return saved
 
     async def save_image(self, image_id: str, image_url: str, image_array, collection_name="image_products"):
         """Save product image embedding"""
@@ -126,6 +192,7 @@ class AsyncQdrantManager:
 
 
     # ------------------ SEARCH ------------------
+    @timed("qdrant.search_messages")
     async def search_messages(self, query: str, user_id: str, limit=5, collection_name="whatsapp_agent"):
         """Retrieve most relevant past messages for a user"""
         if not self.is_connected:
@@ -144,6 +211,7 @@ class AsyncQdrantManager:
         )
         return [hit.payload for hit in results]
 
+    @timed("qdrant.search_image")
     async def search_image(self, image_array, limit=3, collection_name="image_products"):
         """Find similar product images"""
         if not self.is_connected: